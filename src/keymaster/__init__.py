@@ -1,37 +1,130 @@
 """Secure API key management for the services you use, including AI services."""
 
+import atexit
 import os
 import sys
 import logging
+import queue
+from logging.handlers import QueueHandler, QueueListener
 import structlog
 from typing import Any, Dict
+from keymaster import serialization
 
 __version__ = "0.1.1"
 
-# Create .keymaster/logs directory if it doesn't exist
+# Maximum number of log records waiting to be written before new ones are dropped
+LOG_QUEUE_MAXSIZE = 10000
+
+# Size of the application log file write buffer in bytes
+LOG_BUFFER_SIZE = 1 << 16
+
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    Queue handler that starts its listener on the first record and drops records
+    instead of blocking when the queue is full.
+    """
+
+    def __init__(self, listener: QueueListener) -> None:
+        super().__init__(listener.queue)
+        self._listener = listener
+        self._listener_started = False
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # Called with the handler lock held, so the listener is started only once
+        if not self._listener_started:
+            self._listener.start()
+            atexit.register(self._listener.stop)
+            self._listener_started = True
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    File handler that writes through a large buffer instead of flushing every record.
+
+    The log directory and file are created on the first record. Flushing is left
+    to _BufferedQueueListener and to logging.shutdown() at exit.
+    """
+
+    def __init__(self, filename: str) -> None:
+        super().__init__(filename, delay=True)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return open(
+            self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+            encoding=self.encoding, errors=self.errors
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+
+
+class _BufferedQueueListener(QueueListener):
+    """Queue listener that flushes its handlers once the queue has been drained."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            self._flush_handlers()
+
+    def stop(self) -> None:
+        super().stop()
+        self._flush_handlers()
+
+    def _flush_handlers(self) -> None:
+        for handler in self.handlers:
+            handler.flush()
+
+
+def _render_json(event_dict: Dict[str, Any], **kwargs: Any) -> str:
+    """Render a structlog event dict to JSON using the fastest available serializer."""
+    return serialization.dumps(event_dict, default=kwargs.get("default")).decode("utf-8")
+
+
+# Logs go to .keymaster/logs; the directory and file are created on first write
+# so commands that never log (e.g. --help) do no file I/O
 log_dir = os.path.expanduser("~/.keymaster/logs")
-os.makedirs(log_dir, exist_ok=True)
+
+# Log records are queued by the CLI and written to file by a background thread,
+# keeping file I/O off the command path. The thread is started by the first record.
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_MAXSIZE)
+_log_listener = _BufferedQueueListener(
+    _log_queue,
+    _BufferedFileHandler(os.path.join(log_dir, "keymaster.log"))
+)
 
 # Configure logging to write to file
 logging.basicConfig(
     level=logging.INFO,
     format="%(message)s",
     handlers=[
-        logging.FileHandler(os.path.join(log_dir, "keymaster.log"))
+        _DroppingQueueHandler(_log_listener)
     ]
 )
 
 # Configure structlog to write to file only, not console
 structlog.configure(
     processors=[
+        # Drop events below the logging level before they are timestamped and rendered
+        structlog.stdlib.filter_by_level,
         structlog.stdlib.add_log_level,
         structlog.stdlib.PositionalArgumentsFormatter(),
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.format_exc_info,
-        structlog.processors.JSONRenderer(),
+        structlog.processors.JSONRenderer(serializer=_render_json),
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
     wrapper_class=structlog.stdlib.BoundLogger,
     cache_logger_on_first_use=True,
-) 
\ No newline at end of file
+)
@@ -5,17 +5,84 @@ This module provides encrypted audit logging with the encryption key stored
 securely in the system keyring rather than in plaintext configuration files.
 """
 
-import json
+import atexit
+import base64
 import os
+import threading
+import time
+from collections import deque
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional, Tuple
 from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import structlog
+from keymaster import serialization
 from keymaster.config import ConfigManager
 from keymaster.exceptions import AuditError, StorageError
 
 log = structlog.get_logger()
 
+# Number of buffered audit events that triggers an immediate flush
+AUDIT_BATCH_SIZE = 64
+
+# Maximum time in seconds a buffered audit event waits before being flushed
+AUDIT_BATCH_INTERVAL = 0.1
+
+# First byte of sensitive data encrypted with AES-GCM. Older entries are Fernet
+# tokens, whose first byte is always 0x80.
+AESGCM_PAYLOAD_VERSION = b"\x02"
+
+# Size in bytes of the AES-GCM nonce stored with each encrypted value
+AESGCM_NONCE_SIZE = 12
+
+# Flushes written audit lines to disk. macOS has no fdatasync, so fall back
+# to fsync there.
+_sync_file = getattr(os, "fdatasync", os.fsync)
+
+# Size in bytes of the blocks read when scanning the audit log from its end
+AUDIT_REVERSE_READ_SIZE = 1 << 16
+
+# Suffix of the audit log's day index. Each index line records a UTC day and
+# the byte offset of the first event written on it, so date-filtered reads
+# can seek past earlier days instead of scanning the whole log.
+AUDIT_INDEX_SUFFIX = ".idx"
+
+# Suffix of event timestamps written in UTC. These sort correctly as strings,
+# including those without fractional seconds, since '+' sorts before '.'.
+UTC_OFFSET_SUFFIX = "+00:00"
+
+
+# (second, "YYYY-MM-DDTHH:MM:SS") of the last timestamp formatted by _utc_timestamp
+_timestamp_prefix: Tuple[Optional[int], str] = (None, "")
+
+
+def _utc_timestamp() -> str:
+    """
+    Get the current time as a UTC ISO 8601 string with microseconds.
+    
+    The date and time of day are formatted once per second and reused, so
+    bursts of events only format the fractional part.
+    """
+    global _timestamp_prefix
+    seconds, nanos = divmod(time.time_ns(), 1_000_000_000)
+    prefix = _timestamp_prefix
+    if prefix[0] != seconds:
+        prefix = (seconds, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds)))
+        _timestamp_prefix = prefix
+    return f"{prefix[1]}.{nanos // 1000:06d}{UTC_OFFSET_SUFFIX}"
+
+
+def _utc_isoformat(value: datetime) -> str:
+    """
+    Format a datetime as a UTC ISO 8601 string comparable with event timestamps.
+    
+    Naive datetimes, such as dates given on the command line, are taken as local time.
+    """
+    return value.astimezone(timezone.utc).isoformat()
+
+
 class AuditLogger:
     """
     Secure audit logging system for Keymaster operations.
@@ -27,7 +94,17 @@ class AuditLogger:
     def __init__(self):
         self.encryption_key = self._get_encryption_key()
         self.fernet = Fernet(self.encryption_key)
+        self.aesgcm = AESGCM(self._derive_aesgcm_key(self.encryption_key))
+        self._log_path: Optional[str] = None
         self._ensure_log_file()
+        self._pending: deque[bytes] = deque()
+        # Guards the pending buffer and every write to the log file and its day
+        # index. Reentrant because flush() writes while holding it.
+        self._lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._flush_registered = False
+        # Latest day recorded in the day index, read from the index on first write
+        self._indexed_day: Optional[str] = None
         
     def _get_encryption_key(self) -> bytes:
         """
@@ -68,6 +145,27 @@ class AuditLogger:
             log.error("Failed to get audit encryption key", error=str(e))
             raise AuditError(f"Failed to get audit encryption key: {e}", operation="get_encryption_key")
     
+    @staticmethod
+    def _derive_aesgcm_key(encryption_key: bytes) -> bytes:
+        """
+        Derive the AES-GCM key for new audit entries from the stored Fernet key.
+        
+        Deriving the key keeps a single secret in secure storage, which is still
+        needed to decrypt entries written with Fernet.
+        
+        Args:
+            encryption_key: The audit encryption key as stored (a Fernet key)
+            
+        Returns:
+            A 256-bit AES key
+        """
+        return HKDF(
+            algorithm=hashes.SHA256(),
+            length=32,
+            salt=None,
+            info=b"keymaster audit aes-gcm",
+        ).derive(base64.urlsafe_b64decode(encryption_key))
+
     def _migrate_key_from_config(self) -> Optional[bytes]:
         """
         Migrate encryption key from config file to secure storage.
@@ -105,11 +203,18 @@ class AuditLogger:
         return None
 
     def _get_log_path(self) -> str:
-        """Get the path to the audit log file."""
-        home_dir = os.path.expanduser("~")
-        log_dir = os.path.join(home_dir, ".keymaster", "logs")
-        os.makedirs(log_dir, exist_ok=True, mode=0o700)  # Secure permissions
-        return os.path.join(log_dir, "audit.log")
+        """
+        Get the path to the audit log file.
+        
+        The log directory is created on the first call; later calls return the
+        cached path without touching the filesystem.
+        """
+        if self._log_path is None:
+            home_dir = os.path.expanduser("~")
+            log_dir = os.path.join(home_dir, ".keymaster", "logs")
+            os.makedirs(log_dir, exist_ok=True, mode=0o700)  # Secure permissions
+            self._log_path = os.path.join(log_dir, "audit.log")
+        return self._log_path
 
     def _ensure_log_file(self) -> None:
         """Ensure the audit log file exists with secure permissions."""
@@ -145,7 +250,11 @@ class AuditLogger:
             AuditError: If encryption fails
         """
         try:
-            return self.fernet.encrypt(data.encode()).decode()
+            nonce = os.urandom(AESGCM_NONCE_SIZE)
+            ciphertext = self.aesgcm.encrypt(nonce, data.encode(), None)
+            return base64.urlsafe_b64encode(
+                AESGCM_PAYLOAD_VERSION + nonce + ciphertext
+            ).decode("ascii")
         except Exception as e:
             log.error("Failed to encrypt sensitive data", error=str(e))
             raise AuditError(f"Failed to encrypt sensitive data: {e}", operation="encrypt")
@@ -154,6 +263,8 @@ class AuditLogger:
         """
         Decrypt sensitive data from storage.
         
+        Handles both AES-GCM payloads and Fernet tokens written by older versions.
+        
         Args:
             encrypted_data: The encrypted data as a base64 string
             
@@ -164,11 +275,178 @@ class AuditLogger:
             AuditError: If decryption fails
         """
         try:
-            return self.fernet.decrypt(encrypted_data.encode()).decode()
+            raw = base64.urlsafe_b64decode(encrypted_data)
+            if raw[:1] != AESGCM_PAYLOAD_VERSION:
+                return self.fernet.decrypt(encrypted_data.encode()).decode()
+            nonce_end = 1 + AESGCM_NONCE_SIZE
+            return self.aesgcm.decrypt(raw[1:nonce_end], raw[nonce_end:], None).decode()
         except Exception as e:
             log.error("Failed to decrypt sensitive data", error=str(e))
             raise AuditError(f"Failed to decrypt sensitive data: {e}", operation="decrypt")
 
+    def _build_event(self,
+                     event_type: str,
+                     user: str,
+                     service: str = None,
+                     environment: str = None,
+                     sensitive_data: str = None,
+                     additional_data: dict = None) -> bytes:
+        """
+        Build a serialized audit log line for an event.
+        
+        Returns:
+            The event as a compact UTF-8 JSON line, including the trailing newline
+        """
+        now = _utc_timestamp()
+        
+        # Create the event data
+        event = {
+            "timestamp": now,
+            "event_type": event_type,
+            "user": user
+        }
+        
+        # Add optional fields if provided
+        if service:
+            event["service"] = service
+        if environment:
+            event["environment"] = environment
+            
+        # Encrypt sensitive data if provided
+        if sensitive_data:
+            event["encrypted_data"] = self._encrypt_sensitive_data(sensitive_data)
+            
+        # Add any additional metadata
+        if additional_data:
+            event["metadata"] = additional_data
+            
+        return serialization.dumps(event) + b'\n'
+
+    def _write_lines(self, lines: list[bytes], sync: bool = False) -> None:
+        """
+        Append serialized audit lines to the log file in a single write.
+        
+        Args:
+            lines: Serialized events to append
+            sync: Whether to sync the file to disk before returning. Batched
+                writes pass True, so a batch costs one sync; single events are
+                left to the OS as before.
+        """
+        log_path = self._get_log_path()
+        with self._lock, open(log_path, 'ab') as f:
+            self._update_index(log_path, f.tell())
+            f.write(b''.join(lines))
+            if sync:
+                f.flush()
+                _sync_file(f.fileno())
+
+    def _read_index(self, log_path: str) -> Optional[list[Tuple[str, int]]]:
+        """
+        Read the day index of the audit log.
+        
+        Returns:
+            (day, offset) entries in the order they were written, or None if
+            there is no index
+        """
+        try:
+            with open(log_path + AUDIT_INDEX_SUFFIX, "rb") as f:
+                entries = []
+                for line in f:
+                    try:
+                        entry = serialization.loads(line)
+                        entries.append((entry["day"], entry["offset"]))
+                    except (ValueError, KeyError, TypeError):
+                        continue
+                return entries
+        except FileNotFoundError:
+            return None
+
+    def _append_index(self, log_path: str, entries: list[Tuple[str, int]]) -> None:
+        """Append (day, offset) entries to the day index of the audit log."""
+        fd = os.open(log_path + AUDIT_INDEX_SUFFIX, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "ab") as f:
+            f.write(b"".join(
+                serialization.dumps({"day": day, "offset": offset}) + b"\n"
+                for day, offset in entries
+            ))
+
+    def _rebuild_index(self, log_path: str) -> list[Tuple[str, int]]:
+        """
+        Build the day index for a log written before the index existed.
+        
+        Returns:
+            The (day, offset) entries written to the new index
+        """
+        entries = []
+        latest_day = ""
+        offset = 0
+        with open(log_path, "rb") as f:
+            for line in f:
+                try:
+                    day = _utc_isoformat(datetime.fromisoformat(
+                        serialization.loads(line)["timestamp"]
+                    ))[:10]
+                except (ValueError, KeyError, TypeError):
+                    day = None
+                if day and day > latest_day:
+                    entries.append((day, offset))
+                    latest_day = day
+                offset += len(line)
+        self._append_index(log_path, entries)
+        return entries
+
+    def _update_index(self, log_path: str, offset: int) -> None:
+        """
+        Record today in the day index if it is later than any day recorded so far.
+        
+        Every line before an index entry is from an earlier day than the entry,
+        which is what lets readers seek to it. Events are timestamped before they
+        are written, so indexing by write time never places an event before the
+        entry for its own day.
+        
+        Args:
+            log_path: Path of the audit log
+            offset: Byte offset at which the next lines will be written
+        """
+        try:
+            if self._indexed_day is None:
+                entries = self._read_index(log_path)
+                if entries is None:
+                    entries = self._rebuild_index(log_path) if offset else []
+                self._indexed_day = max((day for day, _ in entries), default="")
+            
+            today = datetime.now(timezone.utc).date().isoformat()
+            if today > self._indexed_day:
+                self._append_index(log_path, [(today, offset)])
+                self._indexed_day = today
+        except Exception as e:
+            # The index only speeds up reads; never fail an audit write over it
+            log.warning("Failed to update audit log index", error=str(e))
+
+    def _start_offset(self, log_path: str, start_day: str) -> int:
+        """
+        Get the byte offset from which events on or after a UTC day can appear.
+        
+        Args:
+            log_path: Path of the audit log
+            start_day: UTC day as YYYY-MM-DD
+            
+        Returns:
+            The offset to start reading from, or 0 to read the whole log
+        """
+        entries = self._read_index(log_path)
+        if not entries or entries[0][1] != 0:
+            return 0
+        
+        size = os.path.getsize(log_path)
+        for day, offset in entries:
+            if offset > size:
+                # The log was truncated without its index; don't trust it
+                return 0
+            if day >= start_day:
+                return offset
+        return size
+
     def log_event(self, 
                 event_type: str,
                 user: str,
@@ -191,34 +469,12 @@ class AuditLogger:
             AuditError: If logging fails
         """
         try:
-            now = datetime.now(timezone.utc).isoformat()
+            line = self._build_event(
+                event_type, user, service, environment, sensitive_data, additional_data
+            )
             
-            # Create the event data
-            event = {
-                "timestamp": now,
-                "event_type": event_type,
-                "user": user
-            }
-            
-            # Add optional fields if provided
-            if service:
-                event["service"] = service
-            if environment:
-                event["environment"] = environment
-                
-            # Encrypt sensitive data if provided
-            if sensitive_data:
-                event["encrypted_data"] = self._encrypt_sensitive_data(sensitive_data)
-                
-            # Add any additional metadata
-            if additional_data:
-                event["metadata"] = additional_data
-                
             # Write to log file
-            log_path = self._get_log_path()
-            with open(log_path, 'a') as f:
-                json.dump(event, f, separators=(',', ':'))  # Compact JSON
-                f.write('\n')
+            self._write_lines([line])
                 
             log.info("Audit event logged", 
                     event_type=event_type, 
@@ -233,86 +489,302 @@ class AuditLogger:
                      error=str(e))
             raise AuditError(f"Failed to log audit event: {e}", operation="log_event")
 
-    def get_events(self, 
-                  start_date: Optional[datetime] = None,
-                  end_date: Optional[datetime] = None,
-                  event_type: Optional[str] = None,
-                  service: Optional[str] = None,
-                  environment: Optional[str] = None,
-                  decrypt: bool = False) -> list[Dict[str, Any]]:
+    def log_events(self, events: list[dict]) -> None:
         """
-        Retrieve audit events with optional filtering and decryption.
+        Log several audit events with a single write to the log file.
         
         Args:
-            start_date: Optional start date for filtering
-            end_date: Optional end date for filtering
-            event_type: Optional event type for filtering
-            service: Optional service name for filtering
-            environment: Optional environment for filtering
-            decrypt: Whether to decrypt sensitive data
-            
-        Returns:
-            List of audit events matching the filters
+            events: Keyword arguments for each event, as accepted by log_event
             
         Raises:
-            AuditError: If retrieval fails
+            AuditError: If logging fails; no events are written in that case
         """
+        if not events:
+            return
         try:
-            events = []
-            log_path = self._get_log_path()
-            
-            if not os.path.exists(log_path):
-                log.warning("Audit log file does not exist", path=log_path)
-                return events
+            lines = [self._build_event(**event) for event in events]
+            self._write_lines(lines, sync=True)
+        except Exception as e:
+            log.error("Failed to log audit events", 
+                     event_types=[event.get("event_type") for event in events], 
+                     error=str(e))
+            raise AuditError(f"Failed to log audit events: {e}", operation="log_events")
+        
+        log.info("Audit events logged", count=len(lines))
+
+    def log_event_batched(self,
+                          event_type: str,
+                          user: str,
+                          service: str = None,
+                          environment: str = None,
+                          sensitive_data: str = None,
+                          additional_data: dict = None) -> None:
+        """
+        Buffer an audit event and write it together with other pending events.
+        
+        Pending events are written once AUDIT_BATCH_SIZE events are buffered,
+        after AUDIT_BATCH_INTERVAL seconds, on flush(), or at interpreter exit.
+        Takes the same arguments as log_event.
+        
+        Raises:
+            AuditError: If the event cannot be built or a size-triggered flush fails
+        """
+        try:
+            line = self._build_event(
+                event_type, user, service, environment, sensitive_data, additional_data
+            )
+        except Exception as e:
+            log.error("Failed to log audit event", 
+                     event_type=event_type, 
+                     service=service, 
+                     environment=environment, 
+                     error=str(e))
+            raise AuditError(f"Failed to log audit event: {e}", operation="log_event")
+        
+        with self._lock:
+            self._pending.append(line)
+            pending_count = len(self._pending)
+            if not self._flush_registered:
+                atexit.register(self.flush)
+                self._flush_registered = True
+            if pending_count < AUDIT_BATCH_SIZE and self._flush_timer is None:
+                self._flush_timer = threading.Timer(AUDIT_BATCH_INTERVAL, self._flush_from_timer)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        
+        if pending_count >= AUDIT_BATCH_SIZE:
+            self.flush()
+
+    def _flush_from_timer(self) -> None:
+        """Flush pending events from the background timer thread."""
+        try:
+            self.flush()
+        except AuditError:
+            pass  # Already logged; events stay buffered for the next flush
+
+    def flush(self) -> None:
+        """
+        Write all buffered audit events to the log file.
+        
+        Raises:
+            AuditError: If writing fails; the events remain buffered
+        """
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            lines = list(self._pending)
+            try:
+                self._write_lines(lines, sync=True)
+            except Exception as e:
+                log.error("Failed to flush audit events", count=len(lines), error=str(e))
+                raise AuditError(f"Failed to flush audit events: {e}", operation="flush")
+            self._pending.clear()
+        log.info("Audit events flushed", count=len(lines))
+
+    def iter_events(self, 
+                    start_date: Optional[datetime] = None,
+                    end_date: Optional[datetime] = None,
+                    event_type: Optional[str] = None,
+                    service: Optional[str] = None,
+                    environment: Optional[str] = None,
+                    decrypt: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream audit events from the log file with optional filtering and decryption.
+        
+        Events are read and yielded one at a time, so the whole log is never
+        held in memory. Takes the same filters as get_events.
+        
+        Yields:
+            Audit events matching the filters, oldest first
             
-            # Check if log file is empty
-            if os.path.getsize(log_path) == 0:
-                return events
-                
-            with open(log_path, "r") as f:
+        Raises:
+            AuditError: If reading the log fails
+        """
+        # Make sure buffered events are visible to readers
+        self.flush()
+        
+        log_path = self._get_log_path()
+        if not os.path.exists(log_path):
+            log.warning("Audit log file does not exist", path=log_path)
+            return
+        
+        # Date bounds as UTC ISO strings. Event timestamps are written in UTC, so
+        # they can be compared as strings without parsing each one.
+        start_iso = _utc_isoformat(start_date) if start_date else None
+        end_iso = _utc_isoformat(end_date) if end_date else None
+        
+        # Serialized values that must appear in a matching line. Lines without
+        # them are skipped before JSON parsing. Only ASCII values are used since
+        # older log lines may have escaped non-ASCII characters.
+        needles = [
+            serialization.dumps(value)
+            for value in (event_type, service, environment)
+            if value and value.isascii()
+        ]
+        
+        # Only the filters that were given are checked per event, so reading
+        # the whole log does no per-event filter work at all
+        field_filters = [
+            (field, value)
+            for field, value in (
+                ("event_type", event_type), ("service", service), ("environment", environment)
+            )
+            if value
+        ]
+        check_dates = bool(start_iso or end_iso)
+        fromisoformat = datetime.fromisoformat
+        
+        try:
+            with open(log_path, "rb") as f:
+                if start_iso:
+                    f.seek(self._start_offset(log_path, start_iso[:10]))
                 for line_num, line in enumerate(f, 1):
                     line = line.strip()
                     if not line:  # Skip empty lines
                         continue
+                    if needles and not all(needle in line for needle in needles):
+                        continue
                     
                     try:
-                        event = json.loads(line)
-                    except json.JSONDecodeError as e:
+                        event = serialization.loads(line)
+                    except ValueError as e:
                         log.warning("Failed to parse audit log line", 
                                    line_number=line_num, 
                                    error=str(e))
                         continue
                     
                     # Apply filters
-                    if start_date and datetime.fromisoformat(event["timestamp"]) < start_date:
-                        continue
-                    if end_date and datetime.fromisoformat(event["timestamp"]) > end_date:
-                        continue
-                    if event_type and event.get("event_type") != event_type:
-                        continue
-                    if service and event.get("service") != service:
-                        continue
-                    if environment and event.get("environment") != environment:
+                    if field_filters and any(
+                        event.get(field) != value for field, value in field_filters
+                    ):
                         continue
+                    if check_dates:
+                        timestamp = event["timestamp"]
+                        if not timestamp.endswith(UTC_OFFSET_SUFFIX):
+                            timestamp = _utc_isoformat(fromisoformat(timestamp))
+                        if start_iso and timestamp < start_iso:
+                            continue
+                        if end_iso and timestamp > end_iso:
+                            continue
                     
                     # Optionally decrypt sensitive data
                     if decrypt and "encrypted_data" in event:
-                        try:
-                            event["decrypted_data"] = self._decrypt_sensitive_data(event["encrypted_data"])
-                        except Exception as e:
-                            log.warning("Failed to decrypt audit event data", 
-                                       line_number=line_num, 
-                                       error=str(e))
-                            event["decryption_error"] = str(e)
+                        self._add_decrypted_data(event)
                         
-                    events.append(event)
+                    yield event
                     
-            return events
-            
         except Exception as e:
             log.error("Failed to retrieve audit events", error=str(e))
             raise AuditError(f"Failed to retrieve audit events: {e}", operation="get_events")
 
+    def _add_decrypted_data(self, event: Dict[str, Any]) -> None:
+        """Decrypt an event's sensitive data in place, recording any failure on the event."""
+        try:
+            event["decrypted_data"] = self._decrypt_sensitive_data(event["encrypted_data"])
+        except Exception as e:
+            log.warning("Failed to decrypt audit event data", 
+                       timestamp=event.get("timestamp"), 
+                       error=str(e))
+            event["decryption_error"] = str(e)
+
+    def _iter_lines_reversed(self, log_path: str) -> Iterator[bytes]:
+        """Yield the lines of a file from last to first, reading it in blocks from the end."""
+        with open(log_path, "rb") as f:
+            position = f.seek(0, os.SEEK_END)
+            remainder = b""
+            while position > 0:
+                read_size = min(AUDIT_REVERSE_READ_SIZE, position)
+                position -= read_size
+                f.seek(position)
+                lines = (f.read(read_size) + remainder).split(b"\n")
+                # The first piece may be the end of a line that starts in an earlier block
+                remainder = lines.pop(0)
+                yield from reversed(lines)
+            yield remainder
+
+    def get_recent_events(self, limit: int, decrypt: bool = False) -> list[Dict[str, Any]]:
+        """
+        Retrieve the most recent audit events.
+        
+        The log is read backwards from its end, so only the returned events are
+        parsed and decrypted, however long the log is.
+        
+        Args:
+            limit: Maximum number of events to return
+            decrypt: Whether to decrypt sensitive data
+            
+        Returns:
+            Up to limit events, oldest first
+            
+        Raises:
+            AuditError: If reading the log fails
+        """
+        # Make sure buffered events are visible to readers
+        self.flush()
+        
+        log_path = self._get_log_path()
+        if limit <= 0 or not os.path.exists(log_path):
+            return []
+        
+        events = []
+        try:
+            for line in self._iter_lines_reversed(log_path):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    event = serialization.loads(line)
+                except ValueError as e:
+                    log.warning("Failed to parse audit log line", error=str(e))
+                    continue
+                if decrypt and "encrypted_data" in event:
+                    self._add_decrypted_data(event)
+                events.append(event)
+                if len(events) >= limit:
+                    break
+        except Exception as e:
+            log.error("Failed to retrieve recent audit events", error=str(e))
+            raise AuditError(f"Failed to retrieve audit events: {e}", operation="get_recent_events")
+        
+        events.reverse()
+        return events
+
+    def get_events(self, 
+                  start_date: Optional[datetime] = None,
+                  end_date: Optional[datetime] = None,
+                  event_type: Optional[str] = None,
+                  service: Optional[str] = None,
+                  environment: Optional[str] = None,
+                  decrypt: bool = False) -> list[Dict[str, Any]]:
+        """
+        Retrieve audit events with optional filtering and decryption.
+        
+        Args:
+            start_date: Optional start date for filtering
+            end_date: Optional end date for filtering
+            event_type: Optional event type for filtering
+            service: Optional service name for filtering
+            environment: Optional environment for filtering
+            decrypt: Whether to decrypt sensitive data
+            
+        Returns:
+            List of audit events matching the filters
+            
+        Raises:
+            AuditError: If retrieval fails
+        """
+        return list(self.iter_events(
+            start_date=start_date,
+            end_date=end_date,
+            event_type=event_type,
+            service=service,
+            environment=environment,
+            decrypt=decrypt
+        ))
+
     def clear_events(self, confirm: bool = False) -> None:
         """
         Clear all audit events (use with caution).
@@ -327,9 +799,21 @@ class AuditLogger:
             raise AuditError("Must confirm clearing of audit events", operation="clear_events")
         
         try:
-            log_path = self._get_log_path()
-            with open(log_path, 'w') as f:
-                pass  # Truncate file
+            with self._lock:
+                # Drop buffered events too, or a later flush would write them back
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                self._pending.clear()
+                
+                log_path = self._get_log_path()
+                with open(log_path, 'w') as f:
+                    pass  # Truncate file
+                try:
+                    os.remove(log_path + AUDIT_INDEX_SUFFIX)
+                except FileNotFoundError:
+                    pass
+                self._indexed_day = None
             log.warning("Cleared all audit events")
             
         except Exception as e:
@@ -338,7 +822,10 @@ class AuditLogger:
 
     def export_events(self, output_path: str, decrypt: bool = False) -> None:
         """
-        Export audit events to a file.
+        Export audit events to a file as a JSON array.
+        
+        Events are streamed from the log to the file one at a time, so exports
+        of any size run in constant memory.
         
         Args:
             output_path: Path to export the events to
@@ -348,14 +835,47 @@ class AuditLogger:
             AuditError: If export fails
         """
         try:
-            events = self.get_events(decrypt=decrypt)
-            
-            with open(output_path, 'w') as f:
-                json.dump(events, f, indent=2, default=str)
+            # Create the file owner-only so decrypted data is never readable by others
+            fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                os.fchmod(fd, 0o600)  # Secure permissions for an existing file too
+                count = 0
+                f.write(b'[')
+                for event in self.iter_events(decrypt=decrypt):
+                    f.write(b',\n  ' if count else b'\n  ')
+                    f.write(serialization.dumps(event, default=str))
+                    count += 1
+                f.write(b'\n]\n' if count else b']\n')
             
-            os.chmod(output_path, 0o600)  # Secure permissions
-            log.info("Exported audit events", output_path=output_path, count=len(events))
+            log.info("Exported audit events", output_path=output_path, count=count)
             
         except Exception as e:
             log.error("Failed to export audit events", output_path=output_path, error=str(e))
-            raise AuditError(f"Failed to export audit events: {e}", operation="export_events")
\ No newline at end of file
+            raise AuditError(f"Failed to export audit events: {e}", operation="export_events")
+
+
+# Shared AuditLogger for the process, created on first use by get_audit_logger()
+_audit_logger: Optional[AuditLogger] = None
+_audit_logger_lock = threading.Lock()
+
+
+def get_audit_logger() -> AuditLogger:
+    """
+    Get the process-wide AuditLogger, creating it on first use.
+    
+    Creating an AuditLogger reads the encryption key from secure storage and
+    checks the log file, so commands share one instance instead of paying
+    that cost for every event.
+    
+    Returns:
+        The shared AuditLogger
+        
+    Raises:
+        AuditError: If the AuditLogger cannot be created
+    """
+    global _audit_logger
+    if _audit_logger is None:
+        with _audit_logger_lock:
+            if _audit_logger is None:
+                _audit_logger = AuditLogger()
+    return _audit_logger
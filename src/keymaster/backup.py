@@ -6,25 +6,72 @@ metadata, and audit logs with strong encryption.
 """
 
 import os
-import json
-import zipfile
+import hashlib
+import hmac
+import mmap
+import secrets
 import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 import structlog
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
 import base64
 
+from keymaster import serialization
 from keymaster.security import KeyStore
-from keymaster.audit import AuditLogger
+from keymaster.audit import get_audit_logger
 from keymaster.exceptions import BackupError
 from keymaster.config import ConfigManager
+from keymaster.utils import get_current_user
 
 log = structlog.get_logger()
 
+# PBKDF2 iterations for deriving backup encryption keys from passwords
+BACKUP_KDF_ITERATIONS = 100000
+
+# Backup files start with this header followed by a random salt of
+# BACKUP_SALT_SIZE bytes and a nonce of BACKUP_NONCE_SIZE bytes, then the
+# deflated JSON payload encrypted with AES-256-GCM. The header and salt are
+# not secret but are authenticated along with the payload.
+BACKUP_FILE_HEADER = b"KMBK\x03"
+BACKUP_SALT_SIZE = 16
+BACKUP_NONCE_SIZE = 12
+
+# zlib compression level for backup payloads; higher levels gain little on JSON
+BACKUP_COMPRESSION_LEVEL = 6
+
+# Salt shared by all backups written before per-backup salts. Those backups
+# have no header, hold a Fernet token of the uncompressed JSON payload and are
+# still accepted on restore.
+LEGACY_BACKUP_SALT = b"keymaster_backup_salt_v1"
+
+# Number of most recent audit events included in a backup
+BACKUP_AUDIT_EVENT_LIMIT = 1000
+
+# Maximum number of derived backup keys kept in memory, so that listing and then
+# restoring a backup with the same password runs the KDF only once
+DERIVED_KEY_CACHE_SIZE = 8
+
+# Derived keys, indexed by (salt, HMAC of the password under _derived_key_secret).
+# The random per-process secret means the cache never holds a plain hash of a
+# password that could be brute-forced faster than PBKDF2 itself.
+_derived_keys: Dict[tuple, bytes] = {}
+_derived_keys_lock = threading.Lock()
+_derived_key_secret = secrets.token_bytes(32)
+
+
+def clear_derived_key_cache() -> None:
+    """Forget all cached backup encryption keys."""
+    with _derived_keys_lock:
+        _derived_keys.clear()
+
 
 class BackupManager:
     """Manages backup and restore operations for Keymaster data."""
@@ -34,7 +81,7 @@ class BackupManager:
     
     def __init__(self):
         self.config_manager = ConfigManager()
-        self.audit_logger = AuditLogger()
+        self.audit_logger = get_audit_logger()
     
     def create_backup(
         self, 
@@ -63,9 +110,9 @@ class BackupManager:
         try:
             log.info("Starting backup creation", path=backup_path)
             
-            # Generate encryption key from password
-            encryption_key = self._derive_key_from_password(password)
-            fernet = Fernet(encryption_key)
+            # Generate encryption key from password and a fresh salt
+            salt = os.urandom(BACKUP_SALT_SIZE)
+            encryption_key = self._derive_key_from_password(password, salt)
             
             # Collect data to backup
             backup_data = self._collect_backup_data(
@@ -76,13 +123,13 @@ class BackupManager:
             
             # Create backup file
             backup_summary = self._create_encrypted_backup_file(
-                backup_path, backup_data, fernet
+                backup_path, backup_data, encryption_key, salt
             )
             
             # Log backup creation
             self.audit_logger.log_event(
                 event_type="backup_created",
-                user=os.getenv("USER", "unknown"),
+                user=get_current_user(),
                 additional_data={
                     "backup_path": backup_path,
                     "include_audit_logs": include_audit_logs,
@@ -124,19 +171,7 @@ class BackupManager:
         try:
             log.info("Starting backup restore", path=backup_path, dry_run=dry_run)
             
-            # Validate backup file exists
-            if not os.path.exists(backup_path):
-                raise BackupError(f"Backup file not found: {backup_path}", "restore", backup_path)
-            
-            # Generate decryption key from password
-            encryption_key = self._derive_key_from_password(password)
-            fernet = Fernet(encryption_key)
-            
-            # Extract and decrypt backup data
-            backup_data = self._extract_backup_data(backup_path, fernet)
-            
-            # Validate backup integrity
-            self._validate_backup_data(backup_data)
+            backup_data = self._load_backup(backup_path, password)
             
             if dry_run:
                 return self._analyze_backup_contents(backup_data)
@@ -147,7 +182,7 @@ class BackupManager:
             # Log restore operation
             self.audit_logger.log_event(
                 event_type="backup_restored",
-                user=os.getenv("USER", "unknown"),
+                user=get_current_user(),
                 additional_data={
                     "backup_path": backup_path,
                     "overwrite_existing": overwrite_existing,
@@ -186,23 +221,76 @@ class BackupManager:
         Returns:
             True if backup is valid and password is correct
         """
+        # Only decrypt and validate the backup; unlike list_backup_contents this
+        # does not enumerate the key store to work out restore conflicts
         try:
-            self.list_backup_contents(backup_path, password)
+            self._load_backup(backup_path, password)
             return True
         except Exception:
             return False
     
-    def _derive_key_from_password(self, password: str) -> bytes:
-        """Derive encryption key from password using PBKDF2."""
-        # Use a fixed salt for simplicity - in production, should use random salt stored with backup
-        salt = b"keymaster_backup_salt_v1"
+    def _load_backup(self, backup_path: str, password: str) -> Dict[str, Any]:
+        """
+        Decrypt a backup file and validate its structure.
+        
+        Args:
+            backup_path: Path to the backup file
+            password: Password for decryption
+            
+        Returns:
+            The backup data
+            
+        Raises:
+            BackupError: If the file is missing, cannot be decrypted or is not a valid backup
+        """
+        # Validate backup file exists
+        if not os.path.exists(backup_path):
+            raise BackupError(f"Backup file not found: {backup_path}", "restore", backup_path)
+        
+        # Generate decryption key from password and the backup's salt
+        with self._open_backup_file(backup_path) as (header, salt, encrypted_data):
+            encryption_key = self._derive_key_from_password(password, salt)
+            
+            # Extract and decrypt backup data
+            backup_data = self._extract_backup_data(
+                backup_path, header, salt, encrypted_data, encryption_key
+            )
+        
+        # Validate backup integrity
+        self._validate_backup_data(backup_data)
+        return backup_data
+    
+    def _derive_key_from_password(self, password: str, salt: bytes = LEGACY_BACKUP_SALT) -> bytes:
+        """
+        Derive encryption key from password using PBKDF2.
+        
+        The last DERIVED_KEY_CACHE_SIZE derived keys are kept in memory, so
+        repeated operations on a backup with the same password only pay for
+        the key derivation once.
+        """
+        password_bytes = password.encode()
+        cache_key = (
+            salt, hmac.new(_derived_key_secret, password_bytes, hashlib.sha256).digest()
+        )
+        
+        with _derived_keys_lock:
+            key = _derived_keys.get(cache_key)
+        if key is not None:
+            return key
+        
         kdf = PBKDF2HMAC(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt,
-            iterations=100000,
+            iterations=BACKUP_KDF_ITERATIONS,
         )
-        key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
+        key = base64.urlsafe_b64encode(kdf.derive(password_bytes))
+        
+        with _derived_keys_lock:
+            if len(_derived_keys) >= DERIVED_KEY_CACHE_SIZE:
+                # Drop the oldest entry
+                del _derived_keys[next(iter(_derived_keys))]
+            _derived_keys[cache_key] = key
         return key
     
     def _collect_backup_data(
@@ -216,7 +304,7 @@ class BackupManager:
             "version": self.BACKUP_VERSION,
             "magic": self.BACKUP_MAGIC,
             "created_at": datetime.now().isoformat(),
-            "created_by": os.getenv("USER", "unknown"),
+            "created_by": get_current_user(),
             "keys": [],
             "metadata": [],
             "config": {},
@@ -224,18 +312,12 @@ class BackupManager:
         }
         
         # Collect keys and metadata
-        stored_keys = KeyStore.list_keys(service_filter)
+        stored_keys = KeyStore.list_keys(service_filter, environment_filter)
+        
+        # Get the actual keys, reading their metadata in one query
+        key_values = KeyStore.get_keys([(service, environment) for service, environment, _, _ in stored_keys])
         for service, environment, updated_at, updated_by in stored_keys:
-            # Apply service filter if specified (KeyStore.list_keys might not filter properly)
-            if service_filter and service.lower() != service_filter.lower():
-                continue
-                
-            # Apply environment filter if specified
-            if environment_filter and environment != environment_filter:
-                continue
-                
-            # Get the actual key
-            key_value = KeyStore.get_key(service, environment)
+            key_value = key_values.get((service, environment))
             if key_value:
                 backup_data["keys"].append({
                     "service": service,
@@ -255,10 +337,10 @@ class BackupManager:
         # Collect audit logs if requested
         if include_audit_logs:
             try:
-                # Get all audit events (we'll limit them after retrieval if needed)
-                audit_events = self.audit_logger.get_events(decrypt=True)
-                # Limit to last 1000 events for backup size management
-                backup_data["audit_logs"] = audit_events[-1000:] if len(audit_events) > 1000 else audit_events
+                # Limit to the most recent events for backup size management
+                backup_data["audit_logs"] = self.audit_logger.get_recent_events(
+                    BACKUP_AUDIT_EVENT_LIMIT, decrypt=True
+                )
             except Exception as e:
                 log.warning("Failed to include audit logs in backup", error=str(e))
         
@@ -268,29 +350,54 @@ class BackupManager:
         self, 
         backup_path: str, 
         backup_data: Dict[str, Any], 
-        fernet: Fernet
+        encryption_key: bytes,
+        salt: bytes
     ) -> Dict[str, Any]:
-        """Create encrypted backup file."""
-        # Convert to JSON and encrypt
-        json_data = json.dumps(backup_data, indent=2)
-        encrypted_data = fernet.encrypt(json_data.encode())
+        """Create encrypted backup file, prefixed with the header, key salt and nonce."""
+        # Convert to compact JSON, compress and encrypt. The data is only ever read
+        # back by restore, so indentation would just make it larger. Ciphertext
+        # does not compress, so compression has to happen before encryption.
+        json_data = zlib.compress(serialization.dumps(backup_data), BACKUP_COMPRESSION_LEVEL)
+        nonce = os.urandom(BACKUP_NONCE_SIZE)
+        encrypted_data = self._get_aesgcm(encryption_key).encrypt(
+            nonce, json_data, BACKUP_FILE_HEADER + salt
+        )
+        del json_data
         
         # Create backup file
         backup_dir = os.path.dirname(backup_path)
         if backup_dir and not os.path.exists(backup_dir):
             os.makedirs(backup_dir, mode=0o700)
         
-        with open(backup_path, 'wb') as f:
-            f.write(encrypted_data)
-        
-        # Set secure file permissions
-        os.chmod(backup_path, 0o600)
+        # Write to a temporary file in the same directory and rename it into place,
+        # so an interrupted backup never leaves a truncated file at backup_path.
+        # mkstemp creates the file with 0600 permissions, so it is never readable
+        # by other users, even briefly.
+        fd, temp_path = tempfile.mkstemp(
+            dir=backup_dir or None, prefix=".km_", suffix=".tmp"
+        )
+        try:
+            # Write the ciphertext on its own rather than concatenating it with the
+            # header, which would briefly hold a second copy of it in memory
+            with os.fdopen(fd, 'wb') as f:
+                f.write(BACKUP_FILE_HEADER + salt + nonce)
+                f.write(encrypted_data)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, backup_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
         
         # Create summary
+        _, services, environments = self._summarize_keys(backup_data["keys"])
         summary = {
             "keys_count": len(backup_data["keys"]),
-            "services": list(set(k["service"] for k in backup_data["keys"])),
-            "environments": list(set(k["environment"] for k in backup_data["keys"])),
+            "services": list(services),
+            "environments": list(environments),
             "audit_logs_count": len(backup_data["audit_logs"]),
             "file_size": os.path.getsize(backup_path),
             "created_at": backup_data["created_at"]
@@ -298,14 +405,76 @@ class BackupManager:
         
         return summary
     
-    def _extract_backup_data(self, backup_path: str, fernet: Fernet) -> Dict[str, Any]:
-        """Extract and decrypt backup data from file."""
+    @staticmethod
+    def _get_aesgcm(encryption_key: bytes) -> AESGCM:
+        """Get the AES-256-GCM cipher for a key from _derive_key_from_password."""
+        return AESGCM(base64.urlsafe_b64decode(encryption_key))
+    
+    @contextmanager
+    def _open_backup_file(
+        self, backup_path: str
+    ) -> Iterator[Tuple[Optional[bytes], bytes, memoryview]]:
+        """
+        Memory-map a backup file and split off its header.
+        
+        The file is mapped read-only so the encrypted data is paged in by the
+        kernel rather than copied into a bytes object. The yielded view is only
+        valid inside the with block; the mapping is closed on exit.
+        
+        Yields:
+            The file header, the salt and a view of the encrypted backup data.
+            Backups written before per-backup salts have no header (None) and
+            use LEGACY_BACKUP_SALT.
+        """
         with open(backup_path, 'rb') as f:
-            encrypted_data = f.read()
+            # Empty files cannot be mapped; they fail decryption like any other
+            # corrupted backup
+            mapped = (
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                if os.fstat(f.fileno()).st_size else None
+            )
         
+        contents = memoryview(mapped if mapped is not None else b"")
+        data = None
         try:
-            decrypted_data = fernet.decrypt(encrypted_data)
-            backup_data = json.loads(decrypted_data.decode())
+            header = bytes(contents[:len(BACKUP_FILE_HEADER)])
+            if header != BACKUP_FILE_HEADER:
+                header, salt, data = None, LEGACY_BACKUP_SALT, contents[:]
+            else:
+                salt_end = len(header) + BACKUP_SALT_SIZE
+                if len(contents) < salt_end:
+                    raise BackupError("Invalid backup format - truncated header", "decrypt", backup_path)
+                salt, data = bytes(contents[len(header):salt_end]), contents[salt_end:]
+            yield header, salt, data
+        finally:
+            # Views must be released before the mapping can be closed
+            if data is not None:
+                data.release()
+            contents.release()
+            if mapped is not None:
+                mapped.close()
+    
+    def _extract_backup_data(
+        self, 
+        backup_path: str, 
+        header: Optional[bytes], 
+        salt: bytes,
+        encrypted_data: memoryview, 
+        encryption_key: bytes
+    ) -> Dict[str, Any]:
+        """Decrypt, decompress and parse backup data read from a backup file."""
+        try:
+            if header == BACKUP_FILE_HEADER:
+                decrypted_data = zlib.decompress(self._get_aesgcm(encryption_key).decrypt(
+                    encrypted_data[:BACKUP_NONCE_SIZE],
+                    encrypted_data[BACKUP_NONCE_SIZE:],
+                    header + salt
+                ))
+            else:
+                # Legacy headerless backup; Fernet only accepts bytes, so this
+                # needs a copy
+                decrypted_data = Fernet(encryption_key).decrypt(bytes(encrypted_data))
+            backup_data = serialization.loads(decrypted_data)
             return backup_data
         except Exception as e:
             raise BackupError(f"Failed to decrypt backup - invalid password or corrupted file: {str(e)}", "decrypt", backup_path)
@@ -326,10 +495,25 @@ class BackupManager:
                        backup_version=backup_data["version"], 
                        current_version=self.BACKUP_VERSION)
     
+    @staticmethod
+    def _summarize_keys(keys: List[Dict[str, Any]]) -> Tuple[set, set, set]:
+        """
+        Collect the (service, environment) pairs, services and environments of
+        backed up keys in a single pass.
+        """
+        pairs, services, environments = set(), set(), set()
+        for key_data in keys:
+            service = key_data["service"]
+            environment = key_data["environment"]
+            pairs.add((service, environment))
+            services.add(service)
+            environments.add(environment)
+        return pairs, services, environments
+    
     def _analyze_backup_contents(self, backup_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze backup contents for dry run."""
         existing_keys = {(s, e) for s, e, _, _ in KeyStore.list_keys()}
-        backup_keys = {(k["service"], k["environment"]) for k in backup_data["keys"]}
+        backup_keys, services, environments = self._summarize_keys(backup_data["keys"])
         
         conflicts = existing_keys.intersection(backup_keys)
         new_keys = backup_keys - existing_keys
@@ -338,8 +522,8 @@ class BackupManager:
             "total_keys": len(backup_data["keys"]),
             "new_keys": len(new_keys),
             "conflicts": len(conflicts),
-            "services": list(set(k["service"] for k in backup_data["keys"])),
-            "environments": list(set(k["environment"] for k in backup_data["keys"])),
+            "services": list(services),
+            "environments": list(environments),
             "audit_logs_count": len(backup_data.get("audit_logs", [])),
             "created_at": backup_data["created_at"],
             "created_by": backup_data.get("created_by", "unknown"),
@@ -357,6 +541,12 @@ class BackupManager:
         skipped_keys = 0
         errors = []
         
+        # Keys that already exist, listed once up front rather than looked up
+        # one at a time; not needed at all when they are being overwritten
+        existing_keys = set()
+        if not overwrite_existing:
+            existing_keys = {(s.lower(), e.lower()) for s, e, _, _ in KeyStore.list_keys()}
+        
         for key_data in backup_data["keys"]:
             service = key_data["service"]
             environment = key_data["environment"]
@@ -364,8 +554,7 @@ class BackupManager:
             
             try:
                 # Check if key already exists
-                existing_key = KeyStore.get_key(service, environment)
-                if existing_key and not overwrite_existing:
+                if (service.lower(), environment.lower()) in existing_keys:
                     skipped_keys += 1
                     continue
                 
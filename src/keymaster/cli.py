@@ -1,24 +1,76 @@
 import click
-from keymaster.security import KeyStore
-from keymaster.config import ConfigManager
 from datetime import datetime
+import functools
 import os
-from typing import Optional
-from keymaster.audit import AuditLogger
-from keymaster.env import EnvManager
-from keymaster.utils import prompt_selection
-from keymaster.providers import get_providers, get_provider_by_name
-from keymaster.selection import ServiceEnvironmentSelector
-from keymaster.backup import BackupManager
-from keymaster.rotation import KeyRotator, KeyRotationHistory
-from keymaster.memory_security import secure_temp_string
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from keymaster.utils import prompt_selection, get_current_user
+from keymaster.providers import (
+    get_providers, get_provider_by_name, validate_provider_key, validate_keys_bulk,
+    invalidate_service_validations
+)
 import sys
-from keyring.errors import KeyringError
-from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import locale
 
+# Commands import the key store, audit, config and selection modules when they
+# run, so --help and shell completion don't pay for loading keyring, YAML and
+# cryptography
+if TYPE_CHECKING:
+    from keymaster.audit import AuditLogger
+
 # Default environments
-DEFAULT_ENVIRONMENTS = ["dev", "staging", "prod"]
+DEFAULT_ENVIRONMENTS = ("dev", "staging", "prod")
+
+# Actions offered by add-key when a key already exists for the service and environment
+EXISTING_KEY_ACTIONS = click.Choice(("replace", "keep", "view", "cancel"))
+
+# Maximum number of keys fetched concurrently by list-keys --show-values
+LIST_KEYS_MAX_WORKERS = 8
+
+# Number of characters of audit output accumulated before writing to the terminal
+AUDIT_OUTPUT_CHUNK_SIZE = 4096
+
+# Display format for audit event timestamps (local time)
+AUDIT_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S %Z"
+
+
+def _log_audit_event(audit_logger: "AuditLogger", **event) -> None:
+    """
+    Log an audit event, buffering it for a batched write when KEYMASTER_BATCH=1 is set.
+    """
+    _log_audit_events(audit_logger, [event])
+
+
+def _log_audit_events(audit_logger: "AuditLogger", events: list[dict]) -> None:
+    """
+    Log several audit events from one command with a single write, or buffer them
+    for a batched write when KEYMASTER_BATCH=1 is set.
+    """
+    if os.getenv("KEYMASTER_BATCH") == "1":
+        for event in events:
+            audit_logger.log_event_batched(**event)
+    elif len(events) == 1:
+        audit_logger.log_event(**events[0])
+    else:
+        audit_logger.log_events(events)
+
+
+def _with_cached_listing(command: Callable[..., None]) -> Callable[..., None]:
+    """
+    Run a command with KeyStore.cached_listing() active.
+    
+    Commands and their selection prompts list the stored keys several times;
+    this shares one metadata query for the whole command. It is applied to the
+    command callbacks rather than the group so that `<command> --help`, which
+    is handled before the callback runs, never loads the key store.
+    """
+    @functools.wraps(command)
+    def wrapper(*args: Any, **kwargs: Any) -> None:
+        from keymaster.security import KeyStore
+        with KeyStore.cached_listing():
+            return command(*args, **kwargs)
+    return wrapper
+
 
 @click.group()
 def cli() -> None:
@@ -33,16 +85,24 @@ def init() -> None:
     """
     Initialize Keymaster configuration and resources.
     """
+    from keymaster.security import KeyStore
+    from keymaster.config import ConfigManager
+    from keymaster.audit import get_audit_logger
+    from keyring.errors import KeyringError
+    
     # Track changes
     changes_made = []
     
-    # Check if already initialized by looking for config and directories
+    # Check if already initialized by looking for config and directories,
+    # using a single listing of the .keymaster directory
     config_manager = ConfigManager()
-    is_initialized = (
-        config_manager.config_exists() and
-        os.path.exists(os.path.expanduser("~/.keymaster/logs")) and
-        os.path.exists(os.path.expanduser("~/.keymaster/db"))
-    )
+    base_dir = os.path.expanduser("~/.keymaster")
+    try:
+        existing = {entry.name for entry in os.scandir(base_dir)}
+    except FileNotFoundError:
+        existing = set()
+    config_exists = ConfigManager.CONFIG_FILENAME in existing
+    is_initialized = config_exists and "logs" in existing and "db" in existing
     
     if is_initialized:
         click.echo("Keymaster is already initialized and ready to use.")
@@ -52,7 +112,7 @@ def init() -> None:
     click.echo("Initializing Keymaster...")
     
     # 1. Create initial config file if not present
-    if not config_manager.config_exists():
+    if not config_exists:
         initial_config = {
             "log_level": "INFO",
             "log_file": "~/.keymaster/logs/keymaster.log",
@@ -63,31 +123,22 @@ def init() -> None:
         changes_made.append("Created initial configuration file")
     
     # Create necessary directories
-    dirs_to_create = [
-        os.path.expanduser("~/.keymaster/logs"),
-        os.path.expanduser("~/.keymaster/db")
-    ]
-    
-    for directory in dirs_to_create:
-        if not os.path.exists(directory):
-            os.makedirs(directory, mode=0o700)  # Secure permissions
+    for name in ("logs", "db"):
+        if name not in existing:
+            directory = os.path.join(base_dir, name)
+            os.makedirs(directory, mode=0o700, exist_ok=True)  # Secure permissions
             changes_made.append(f"Created directory: {directory}")
     
     # 2. Verify system requirements and secure storage backend
+    storage_ok = False
     try:
         KeyStore._verify_backend()
         click.echo("Verified secure storage backend.")
         
-        # Test key storage
-        test_service = "__keymaster_test__"
-        test_env = "__test__"
-        test_value = "test_value"
+        # Test key storage with a single store/read/delete probe
+        storage_ok = KeyStore.self_test()
         
-        KeyStore.store_key(test_service, test_env, test_value)
-        retrieved = KeyStore.get_key(test_service, test_env)
-        KeyStore.remove_key(test_service, test_env)
-        
-        if retrieved != test_value:
+        if not storage_ok:
             click.echo("Warning: Secure storage test failed. Key storage may not work correctly.")
         else:
             click.echo("Verified secure storage access.")
@@ -98,14 +149,15 @@ def init() -> None:
         click.echo(f"Warning: Could not verify secure storage access: {str(e)}")
     
     # Log initialization
-    audit_logger = AuditLogger()
-    audit_logger.log_event(
+    audit_logger = get_audit_logger()
+    _log_audit_event(
+        audit_logger,
         event_type="init",
-        user=os.getenv("USER", "unknown"),
+        user=get_current_user(),
         additional_data={
             "action": "init",
             "platform": sys.platform,
-            "storage_test": "success" if retrieved == test_value else "failed",
+            "storage_test": "success" if storage_ok else "failed",
             "changes_made": changes_made
         }
     )
@@ -129,6 +181,10 @@ def add_key(service: str | None, environment: str | None, api_key: str | None, f
     """
     Store a service API key securely in the macOS Keychain.
     """
+    from keymaster.security import KeyStore
+    from keymaster.audit import get_audit_logger
+    from keymaster.selection import ServiceEnvironmentSelector
+    
     # If service not provided, prompt for it
     if not service:
         available_services = ServiceEnvironmentSelector.get_all_available_services()
@@ -149,18 +205,17 @@ def add_key(service: str | None, environment: str | None, api_key: str | None, f
     if not api_key:
         api_key = click.prompt("API key", hide_input=True)
     
-    # Check for existing key
-    existing_key = KeyStore.get_key(service_name, environment)
-    if existing_key and not force:
+    # Audit events for this command, written together once the key is stored
+    audit_events = []
+    
+    # Check for an existing key from its metadata, so adding a new key does not
+    # read secure storage (which may prompt the user to unlock it)
+    key_exists = KeyStore.get_key_metadata(service_name, environment) is not None
+    if key_exists and not force:
         click.echo(f"\nA key already exists for {service_name} ({environment})")
         action = click.prompt(
             "Choose action",
-            type=click.Choice([
-                'replace',
-                'keep',
-                'view',
-                'cancel'
-            ]),
+            type=EXISTING_KEY_ACTIONS,
             default='cancel'
         )
         
@@ -170,7 +225,10 @@ def add_key(service: str | None, environment: str | None, api_key: str | None, f
         elif action == 'keep':
             click.echo("Keeping existing key")
             return
-        elif action == 'view':
+        
+        # Only viewing and backing up need the existing key itself
+        existing_key = KeyStore.get_key(service_name, environment)
+        if action == 'view':
             if click.confirm("Are you sure you want to view the existing key?", default=False):
                 click.echo(f"Existing key: {existing_key}")
             if not click.confirm("Do you want to replace this key?", default=False):
@@ -178,48 +236,53 @@ def add_key(service: str | None, environment: str | None, api_key: str | None, f
                 return
         # 'replace' continues with the operation
         
-        # Backup the old key in secure storage with a timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_service = f"{service_name}_backup_{timestamp}"
-        try:
-            KeyStore.store_key(backup_service, environment, existing_key)
-            click.echo(f"Backed up existing key to {backup_service}")
-            
-            # Log the backup
-            audit_logger = AuditLogger()
-            audit_logger.log_event(
-                event_type="key_backup",
-                service=service_name,
-                environment=environment,
-                user=os.getenv("USER", "unknown"),
-                additional_data={
-                    "action": "backup",
-                    "reason": "key_replacement",
-                    "backup_service": backup_service
-                }
-            )
-        except Exception as e:
-            click.echo(f"Warning: Failed to backup existing key: {str(e)}")
-            if not click.confirm("Continue without backing up the existing key?", default=False):
-                click.echo("Operation cancelled")
-                return
-    
-    # Store the new key
-    KeyStore.store_key(service_name, environment, api_key)
+        # Backup the old key in secure storage with a timestamp. Metadata can
+        # outlive the key itself, in which case there is nothing to back up.
+        if existing_key:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_service = f"{service_name}_backup_{timestamp}"
+            try:
+                KeyStore.store_key(backup_service, environment, existing_key)
+                click.echo(f"Backed up existing key to {backup_service}")
+                
+                # Log the backup together with the new key below
+                audit_events.append({
+                    "event_type": "key_backup",
+                    "service": service_name,
+                    "environment": environment,
+                    "user": get_current_user(),
+                    "additional_data": {
+                        "action": "backup",
+                        "reason": "key_replacement",
+                        "backup_service": backup_service
+                    }
+                })
+            except Exception as e:
+                click.echo(f"Warning: Failed to backup existing key: {str(e)}")
+                if not click.confirm("Continue without backing up the existing key?", default=False):
+                    click.echo("Operation cancelled")
+                    return
     
-    # Add audit logging for the new key
-    audit_logger = AuditLogger()
-    audit_logger.log_event(
-        event_type="add_key",
-        service=service_name,
-        environment=environment,
-        user=os.getenv("USER", "unknown"),
-        sensitive_data=api_key,
-        additional_data={
-            "action": "add",
-            "replaced_existing": bool(existing_key)
-        }
-    )
+    try:
+        # Store the new key
+        KeyStore.store_key(service_name, environment, api_key)
+        
+        # Add audit logging for the new key
+        audit_events.append({
+            "event_type": "add_key",
+            "service": service_name,
+            "environment": environment,
+            "user": get_current_user(),
+            "sensitive_data": api_key,
+            "additional_data": {
+                "action": "add",
+                "replaced_existing": key_exists
+            }
+        })
+    finally:
+        # Record the backup even if storing the new key failed
+        if audit_events:
+            _log_audit_events(get_audit_logger(), audit_events)
     
     click.echo(f"Key for service '{service_name}' ({environment}) stored securely.")
 
@@ -227,10 +290,15 @@ def add_key(service: str | None, environment: str | None, api_key: str | None, f
 @cli.command()
 @click.option("--service", required=False, help="Service name (e.g., OpenAI)")
 @click.option("--environment", required=False, help="Environment (dev/staging/prod)")
+@_with_cached_listing
 def remove_key(service: str | None, environment: str | None) -> None:
     """
     Remove a service API key from the macOS Keychain.
     """
+    from keymaster.security import KeyStore
+    from keymaster.audit import get_audit_logger
+    from keymaster.selection import ServiceEnvironmentSelector
+    
     # Check if we have any keys stored
     if not KeyStore.list_keys():
         click.echo("No keys found.")
@@ -238,7 +306,7 @@ def remove_key(service: str | None, environment: str | None) -> None:
     
     # If service not provided, prompt for it from services with stored keys
     if not service:
-        service = ServiceEnvironmentSelector.select_service_with_keys("Select service:")
+        service = ServiceEnvironmentSelector.select_service_with_keys("Select service:", auto_select=False)
         if not service:
             click.echo("No services found with stored keys.")
             return
@@ -261,7 +329,8 @@ def remove_key(service: str | None, environment: str | None) -> None:
     if not environment:
         environment = ServiceEnvironmentSelector.select_environment_for_service(
             service_name, 
-            allow_new=False
+            allow_new=False,
+            auto_select=False
         )
         if not environment:
             click.echo(f"No environments found with stored keys for service {service_name}.")
@@ -281,28 +350,33 @@ def remove_key(service: str | None, environment: str | None) -> None:
         return
 
     try:
-        # Try to remove from keystore if it exists
-        key_exists = KeyStore.get_key(service_name, environment)
-        if key_exists:
-            try:
-                KeyStore.remove_key(service_name, environment)
+        # Remove from secure storage directly; remove_key reports whether a key
+        # was there, so there is no need to read the key first
+        key_exists = False
+        try:
+            key_exists = KeyStore.remove_key(service_name, environment)
+            if key_exists:
                 click.echo(f"Key for service '{service_name}' ({environment}) removed from secure storage.")
-            except Exception as e:
-                click.echo(f"Warning: Could not remove key from secure storage: {str(e)}")
-        else:
-            click.echo(f"Note: No key found in secure storage for '{service_name}' ({environment})")
+            else:
+                click.echo(f"Note: No key found in secure storage for '{service_name}' ({environment})")
+        except Exception as e:
+            click.echo(f"Warning: Could not remove key from secure storage: {str(e)}")
         
         # Always remove the metadata
         KeyStore.remove_key_metadata(service_name, environment)
+        # The removed key was never read, so drop cached validations for the
+        # whole service rather than for that key
+        invalidate_service_validations(service_name)
         click.echo(f"Metadata for service '{service_name}' ({environment}) removed from database.")
         
         # Add audit logging
-        audit_logger = AuditLogger()
-        audit_logger.log_event(
+        audit_logger = get_audit_logger()
+        _log_audit_event(
+            audit_logger,
             event_type="remove_key",
             service=service_name,
             environment=environment,
-            user=os.getenv("USER", "unknown"),
+            user=get_current_user(),
             additional_data={
                 "action": "remove",
                 "key_existed": bool(key_exists),
@@ -316,47 +390,49 @@ def remove_key(service: str | None, environment: str | None) -> None:
 @cli.command()
 @click.option("--service", required=False, help="Filter by service name.")
 @click.option("--show-values", is_flag=True, default=False, help="Show the actual key values (use with caution).")
+@_with_cached_listing
 def list_keys(service: str | None, show_values: bool) -> None:
     """
     List stored API keys in the macOS Keychain (service names only by default).
     """
+    from keymaster.security import KeyStore
+    
     # Get all keys with their metadata
     keys = KeyStore.list_keys(service)
     if not keys:
         click.echo("No keys found.")
         return
         
-    # Group keys by service
-    service_groups = defaultdict(list)
-    for svc, env, updated_at, updated_by in keys:
-        # Convert ISO timestamp to datetime and localize it
-        dt = datetime.fromisoformat(updated_at).astimezone()
-        
-        # Format date based on locale
-        locale.setlocale(locale.LC_TIME, '')  # Use system locale
-        if locale.getlocale()[0] in ['en_US', 'en_CA']:  # US/Canada format
-            date_str = dt.strftime("%m/%d/%Y %H:%M")
-        else:  # Rest of world format
-            date_str = dt.strftime("%d/%m/%Y %H:%M")
-            
-        service_groups[svc].append((env, date_str, updated_by))
+    # Choose the date format from the system locale once, not per key
+    locale.setlocale(locale.LC_TIME, '')  # Use system locale
+    if locale.getlocale()[0] in ['en_US', 'en_CA']:  # US/Canada format
+        date_format = "%m/%d/%Y %H:%M"
+    else:  # Rest of world format
+        date_format = "%d/%m/%Y %H:%M"
+    
+    # Fetch key values concurrently; each lookup is an independent secure storage call
+    key_values = {}
+    if show_values:
+        pairs = [(svc, env) for svc, env, _, _ in keys]
+        with ThreadPoolExecutor(max_workers=min(LIST_KEYS_MAX_WORKERS, len(pairs))) as executor:
+            key_values = dict(zip(pairs, executor.map(lambda pair: KeyStore.get_key(*pair), pairs)))
     
-    # Display grouped and sorted keys
+    # Keys come back ordered by service and environment, so each service's
+    # keys are consecutive and can be printed in a single pass
     click.echo("Stored keys:")
-    for service_name in sorted(service_groups.keys()):
-        click.echo(f"\nService: {service_name}")
+    current_service = None
+    fromisoformat = datetime.fromisoformat
+    for svc, env, updated_at, updated_by in keys:
+        if svc != current_service:
+            click.echo(f"\nService: {svc}")
+            current_service = svc
         
-        # Sort environments within each service
-        envs = sorted(service_groups[service_name])
-        for env, date_str, updated_by in envs:
-            if show_values:
-                key_value = KeyStore.get_key(service_name, env)
-                click.echo(f"  Environment: {env}")
-                click.echo(f"    Last updated: {date_str} by {updated_by}")
-                click.echo(f"    Key: {key_value}")
-            else:
-                click.echo(f"  Environment: {env}")
-                click.echo(f"    Last updated: {date_str} by {updated_by}")
+        # Convert ISO timestamp to datetime and localize it
+        date_str = fromisoformat(updated_at).astimezone().strftime(date_format)
+        click.echo(f"  Environment: {env}")
+        click.echo(f"    Last updated: {date_str} by {updated_by}")
+        if show_values:
+            click.echo(f"    Key: {key_values[(svc, env)]}")
     
     if show_values:
         click.echo("\nNote: Be careful with displayed key values!")
@@ -368,6 +444,8 @@ def config(action: str) -> None:
     """
     Manage Keymaster configuration. Supports 'show' or 'reset'.
     """
+    from keymaster.config import ConfigManager
+    
     if action == "show":
         # Show YAML configuration
         data = ConfigManager.load_config()
@@ -379,42 +457,19 @@ def config(action: str) -> None:
         else:
             click.echo("No configuration settings found.")
             
-        # Show providers
-        from keymaster.providers import (
-            get_providers, 
-            _load_generic_providers,
-            GenericProvider,
-            OpenAIProvider,
-            AnthropicProvider,
-            StabilityProvider,
-            DeepSeekProvider,
-            _register_provider,
-            _providers
-        )
-        
-        # Clear the provider registry to ensure a clean state
-        _providers.clear()
-        
-        # Register built-in providers
-        _register_provider(OpenAIProvider())
-        _register_provider(AnthropicProvider())
-        _register_provider(StabilityProvider())
-        _register_provider(DeepSeekProvider())
-        
-        # Ensure generic providers are loaded
-        _load_generic_providers()
-        providers = get_providers()
-        
-        # Separate built-in and custom providers
-        builtin_providers = {
-            name: provider for name, provider in providers.items()
-            if isinstance(provider, (OpenAIProvider, AnthropicProvider, StabilityProvider, DeepSeekProvider))
-        }
+        # Show providers. The registry is populated with the built-in and saved
+        # generic providers when keymaster.providers is imported, so it is only
+        # read here, not rebuilt.
+        from keymaster.providers import GenericProvider
         
-        custom_providers = {
-            name: provider for name, provider in providers.items()
-            if isinstance(provider, GenericProvider)
-        }
+        # Separate built-in and custom (generic) providers
+        builtin_providers = {}
+        custom_providers = {}
+        for name, provider in get_providers().items():
+            if isinstance(provider, GenericProvider):
+                custom_providers[name] = provider
+            else:
+                builtin_providers[name] = provider
         
         # Show built-in providers
         click.echo("\nBuilt-in Providers:")
@@ -456,8 +511,10 @@ def audit(service: Optional[str],
          end_date: Optional[datetime],
          decrypt: bool) -> None:
     """View audit logs with optional filtering."""
-    audit_logger = AuditLogger()
-    events = audit_logger.get_events(
+    from keymaster.audit import get_audit_logger
+    
+    audit_logger = get_audit_logger()
+    events = audit_logger.iter_events(
         start_date=start_date,
         end_date=end_date,
         service=service,
@@ -465,24 +522,42 @@ def audit(service: Optional[str],
         decrypt=decrypt
     )
     
-    if not events:
-        click.echo("No audit events found matching criteria.")
-        return
-        
+    # Stream events into chunks so large logs are written with few terminal
+    # writes and without holding every event in memory
+    found = False
+    chunk = []
+    chunk_size = 0
+    parse_timestamp = datetime.fromisoformat
     for event in events:
-        # Convert ISO timestamp to local time and format it
-        timestamp = datetime.fromisoformat(event['timestamp']).astimezone().strftime("%Y-%m-%d %H:%M:%S %Z")
-        click.echo(f"[{timestamp}] {event['event_type']}")
+        found = True
+        # Convert ISO timestamp to local time and format it. astimezone() is
+        # evaluated per event so events on either side of a DST change get the
+        # right offset and zone name.
+        timestamp = parse_timestamp(event['timestamp']).astimezone().strftime(AUDIT_TIMESTAMP_FORMAT)
+        lines = [f"[{timestamp}] {event['event_type']}"]
         if 'service' in event:
-            click.echo(f"  Service: {event['service']}")
+            lines.append(f"  Service: {event['service']}")
         if 'environment' in event:
-            click.echo(f"  Environment: {event['environment']}")
-        click.echo(f"  User: {event['user']}")
+            lines.append(f"  Environment: {event['environment']}")
+        lines.append(f"  User: {event['user']}")
         if decrypt and "decrypted_data" in event:
-            click.echo(f"  Sensitive Data: {event['decrypted_data']}")
+            lines.append(f"  Sensitive Data: {event['decrypted_data']}")
         if "metadata" in event:
-            click.echo(f"  Additional Data: {event['metadata']}")
-        click.echo("")
+            lines.append(f"  Additional Data: {event['metadata']}")
+        
+        block = "\n".join(lines) + "\n\n"
+        chunk.append(block)
+        chunk_size += len(block)
+        if chunk_size >= AUDIT_OUTPUT_CHUNK_SIZE:
+            click.echo("".join(chunk), nl=False)
+            chunk = []
+            chunk_size = 0
+    
+    if chunk:
+        click.echo("".join(chunk), nl=False)
+    
+    if not found:
+        click.echo("No audit events found matching criteria.")
 
 
 @cli.command()
@@ -490,8 +565,13 @@ def audit(service: Optional[str],
 @click.option("--environment", required=False, help="Environment (dev/staging/prod)")
 @click.option("--verbose", is_flag=True, default=False, help="Show detailed test information including API URL and response")
 @click.option("--all", "test_all", is_flag=True, default=False, help="Test all stored keys")
+@_with_cached_listing
 def test_key(service: str | None, environment: str | None, verbose: bool, test_all: bool) -> None:
     """Test an API key to verify it works with the service."""
+    from keymaster.security import KeyStore
+    from keymaster.audit import get_audit_logger
+    from keymaster.selection import ServiceEnvironmentSelector
+    
     # Get list of stored keys
     stored_keys = KeyStore.list_keys()
     if not stored_keys:
@@ -502,73 +582,95 @@ def test_key(service: str | None, environment: str | None, verbose: bool, test_a
         click.echo("Testing all stored keys...\n")
         results = []
         
-        # Group keys by service for better organization
+        # Group keys by service for better organization. Keys are listed in
+        # service and environment order, so the groups need no sorting.
         service_keys = {}
         for svc, env, _, _ in stored_keys:
-            if svc not in service_keys:
-                service_keys[svc] = []
-            service_keys[svc].append(env)
+            service_keys.setdefault(svc, []).append(env)
+        
+        # Fetch every key first so the provider tests can run concurrently
+        providers = {svc: get_provider_by_name(svc) for svc in service_keys}
+        stored = KeyStore.get_keys([
+            (provider.service_name, env)
+            for svc, provider in providers.items() if provider
+            for env in service_keys[svc]
+        ])
+        
+        sections = []
+        items = []
+        for svc, provider in providers.items():
+            if not provider:
+                sections.append((svc, None, []))
+                continue
+            
+            service_name = provider.service_name
+            envs = []
+            for env in service_keys[svc]:
+                key = stored.get((service_name, env))
+                if key:
+                    envs.append((env, len(items)))
+                    items.append((provider, key))
+                else:
+                    envs.append((env, None))
+            sections.append((svc, provider, envs))
         
-        # Test each key
-        for svc in sorted(service_keys.keys()):
-            provider = get_provider_by_name(svc)
+        results = validate_keys_bulk(items)
+        
+        # Report results in service and environment order
+        audit_events = []
+        for svc, provider, envs in sections:
             if not provider:
                 click.echo(f"⚠️  Skipping {svc}: Provider not supported")
                 continue
                 
             service_name = provider.service_name
+            api_url = provider.api_url
             click.echo(f"\n{service_name}:")
             
-            for env in sorted(service_keys[svc]):
-                key = KeyStore.get_key(service_name, env)
-                if not key:
+            for env, index in envs:
+                if index is None:
                     click.echo(f"  [{env}] ⚠️  Key not found")
                     continue
                 
-                try:
-                    if verbose:
-                        click.echo(f"  [{env}] Testing key...")
-                        click.echo(f"  API Endpoint: {provider.api_url}")
-                    
-                    result = provider.test_key(key)
+                if verbose:
+                    click.echo(f"  [{env}] Testing key...")
+                    click.echo(f"  API Endpoint: {api_url}")
+                
+                result, error = results[index]
+                if error is None:
                     click.echo(f"  [{env}] ✅ Valid")
                     
                     if verbose:
                         click.echo("  Response:")
                         click.echo(f"  {result}")
                     
-                    # Log success
-                    audit_logger = AuditLogger()
-                    audit_logger.log_event(
-                        event_type="test_key",
-                        service=service_name,
-                        environment=env,
-                        user=os.getlogin(),
-                        additional_data={
-                            "action": "test",
-                            "result": "success",
-                            "verbose": verbose,
-                            "batch": True
-                        }
-                    )
-                except Exception as e:
-                    click.echo(f"  [{env}] ❌ Invalid: {str(e)}")
+                    additional_data = {
+                        "action": "test",
+                        "result": "success",
+                        "verbose": verbose,
+                        "batch": True
+                    }
+                else:
+                    click.echo(f"  [{env}] ❌ Invalid: {str(error)}")
                     
-                    # Log failure
-                    audit_logger = AuditLogger()
-                    audit_logger.log_event(
-                        event_type="test_key",
-                        service=service_name,
-                        environment=env,
-                        user=os.getlogin(),
-                        additional_data={
-                            "action": "test",
-                            "result": "failed",
-                            "error": str(e),
-                            "verbose": verbose,
-                            "batch": True
-                        }
-                    )
+                    additional_data = {
+                        "action": "test",
+                        "result": "failed",
+                        "error": str(error),
+                        "verbose": verbose,
+                        "batch": True
+                    }
+                
+                audit_events.append({
+                    "event_type": "test_key",
+                    "service": service_name,
+                    "environment": env,
+                    "user": get_current_user(),
+                    "additional_data": additional_data
+                })
+        
+        if audit_events:
+            _log_audit_events(get_audit_logger(), audit_events)
         
         click.echo("\nKey testing complete.")
         return
@@ -612,24 +714,24 @@ def test_key(service: str | None, environment: str | None, verbose: bool, test_a
             click.echo(f"Available environments: {', '.join(available_environments)}")
             return
     
+    # Get the provider for testing before touching secure storage
+    provider = get_provider_by_name(service_name)
+    if not provider:
+        click.echo(f"Error: Provider not found for {service_name}")
+        return
+    
     # Verify the key exists
     key = KeyStore.get_key(service_name, environment)
     if not key:
         click.echo(f"No key found for {service_name} in {environment} environment.")
         return
     
-    # Get the provider for testing
-    provider = get_provider_by_name(service_name)
-    if not provider:
-        click.echo(f"Error: Provider not found for {service_name}")
-        return
-    
     try:
         if verbose:
             click.echo(f"\nTesting key for {service_name} ({environment})...")
             click.echo(f"API Endpoint: {provider.api_url}")
             
-        result = provider.test_key(key)
+        result = validate_provider_key(provider, key)
         click.echo(f"\n✅ Key test successful for {service_name} ({environment})")
         
         if verbose:
@@ -637,12 +739,13 @@ def test_key(service: str | None, environment: str | None, verbose: bool, test_a
             click.echo(f"{result}")
         
         # Add audit logging for the test
-        audit_logger = AuditLogger()
-        audit_logger.log_event(
+        audit_logger = get_audit_logger()
+        _log_audit_event(
+            audit_logger,
             event_type="test_key",
             service=service_name,
             environment=environment,
-            user=os.getlogin(),
+            user=get_current_user(),
             additional_data={
                 "action": "test",
                 "result": "success",
@@ -656,12 +759,13 @@ def test_key(service: str | None, environment: str | None, verbose: bool, test_a
             click.echo(f"\nError details: {str(e)}")
         
         # Log failed test attempt
-        audit_logger = AuditLogger()
-        audit_logger.log_event(
+        audit_logger = get_audit_logger()
+        _log_audit_event(
+            audit_logger,
             event_type="test_key",
             service=service_name,
             environment=environment,
-            user=os.getlogin(),
+            user=get_current_user(),
             additional_data={
                 "action": "test",
                 "result": "failed",
@@ -676,12 +780,14 @@ def test_key(service: str | None, environment: str | None, verbose: bool, test_a
 @click.option("--service", required=False, help="Service name (e.g., OpenAI)")
 @click.option("--environment", required=False, help="Environment (dev/staging/prod)")
 @click.option("--output", required=False, help="Output .env file path")
-def generate_env(service: str | None, environment: str | None, output: str | None) -> None:
+@click.option("--all-envs", is_flag=True, default=False, help="Write the keys for every environment of the service (ignores --environment)")
+@_with_cached_listing
+def generate_env(service: str | None, environment: str | None, output: str | None, all_envs: bool) -> None:
     """Generate a .env file for the specified service and environment."""
-    from keymaster.providers import get_providers, get_provider_by_name, _load_generic_providers
-    
-    # Ensure generic providers are loaded
-    _load_generic_providers()
+    from keymaster.env import EnvManager
+    from keymaster.security import KeyStore
+    from keymaster.audit import get_audit_logger
+    from keymaster.selection import ServiceEnvironmentSelector
     
     # Get list of stored keys
     stored_keys = KeyStore.list_keys()
@@ -711,7 +817,9 @@ def generate_env(service: str | None, environment: str | None, output: str | Non
     service_name = service
     
     # If environment not provided, prompt for it from available environments
-    if not environment:
+    if all_envs:
+        environment = None
+    elif not environment:
         environment = ServiceEnvironmentSelector.select_environment_for_service(
             service_name, 
             allow_new=False
@@ -732,29 +840,45 @@ def generate_env(service: str | None, environment: str | None, output: str | Non
         default_output = ".env"
         output = click.prompt("Output file path", default=default_output)
     
-    # Get the key
-    key = KeyStore.get_key(service_name, environment)
-    if not key:
-        click.echo(f"No key found for {service_name} in {environment} environment.")
-        return
-    
-    # Get environment variable name for the service
-    env_var_name = f"{service_name.upper()}_API_KEY"
+    if all_envs:
+        # Fetch every environment's key at once and write them to a single file,
+        # one variable per environment
+        environments = ServiceEnvironmentSelector.get_environments_for_service(service_name)
+        keys = KeyStore.get_keys([(service_name, env) for env in environments])
+        variables = {
+            f"{service_name.upper()}_API_KEY_{env.upper()}": key
+            for (_, env), key in keys.items() if key
+        }
+        if not variables:
+            click.echo(f"No keys found for {service_name}.")
+            return
+    else:
+        # Get the key
+        key = KeyStore.get_key(service_name, environment)
+        if not key:
+            click.echo(f"No key found for {service_name} in {environment} environment.")
+            return
+        
+        # Get environment variable name for the service
+        variables = {f"{service_name.upper()}_API_KEY": key}
     
     try:
-        EnvManager.generate_env_file(output, {env_var_name: key})
+        EnvManager.generate_env_file(output, variables)
         
         # Add audit logging
-        audit_logger = AuditLogger()
-        audit_logger.log_event(
+        additional_data = {"output_file": output}
+        if all_envs:
+            additional_data.update({"env_vars": list(variables), "count": len(variables)})
+        else:
+            additional_data["env_var"] = next(iter(variables))
+        audit_logger = get_audit_logger()
+        _log_audit_event(
+            audit_logger,
             event_type="generate_env",
             service=service_name,
             environment=environment,
-            user=os.getlogin(),
-            additional_data={
-                "output_file": output,
-                "env_var": env_var_name
-            }
+            user=get_current_user(),
+            additional_data=additional_data
         )
         
         click.echo(f"Generated .env file at {output}")
@@ -768,8 +892,14 @@ def generate_env(service: str | None, environment: str | None, output: str | Non
 @click.option("--verbose", is_flag=True, default=False, help="Show detailed test information including API URL and response")
 @click.option("--no-backup", is_flag=True, default=False, help="Skip creating backup before rotation")
 @click.option("--no-test", is_flag=True, default=False, help="Skip testing new key before storage")
+@_with_cached_listing
 def rotate_key(service: str | None, environment: str | None, verbose: bool, no_backup: bool, no_test: bool) -> None:
     """Rotate an API key with enhanced backup and validation capabilities."""
+    from keymaster.rotation import KeyRotator, KeyRotationHistory
+    from keymaster.memory_security import secure_temp_string
+    from keymaster.security import KeyStore
+    from keymaster.selection import ServiceEnvironmentSelector
+    
     # Get list of stored keys with metadata
     stored_keys = KeyStore.list_keys()
     if not stored_keys:
@@ -778,7 +908,7 @@ def rotate_key(service: str | None, environment: str | None, verbose: bool, no_b
     
     # If service not provided, prompt for it from services with stored keys
     if not service:
-        service = ServiceEnvironmentSelector.select_service_with_keys("Select service:")
+        service = ServiceEnvironmentSelector.select_service_with_keys("Select service:", auto_select=False)
         if not service:
             click.echo("No services found with stored keys.")
             return
@@ -801,7 +931,8 @@ def rotate_key(service: str | None, environment: str | None, verbose: bool, no_b
     if not environment:
         environment = ServiceEnvironmentSelector.select_environment_for_service(
             service_name, 
-            allow_new=False
+            allow_new=False,
+            auto_select=False
         )
         if not environment:
             click.echo(f"No environments found with stored keys for service {service_name}.")
@@ -892,6 +1023,8 @@ def rotate_key(service: str | None, environment: str | None, verbose: bool, no_b
 @click.option("--no-audit", is_flag=True, default=False, help="Exclude audit logs from backup")
 def backup(output: str | None, password: str | None, service: str | None, environment: str | None, no_audit: bool) -> None:
     """Create an encrypted backup of API keys and metadata."""
+    from keymaster.backup import BackupManager
+    
     try:
         backup_manager = BackupManager()
         
@@ -936,6 +1069,8 @@ def backup(output: str | None, password: str | None, service: str | None, enviro
 @click.option("--overwrite", is_flag=True, default=False, help="Overwrite existing keys")
 def restore(backup_file: str | None, password: str | None, dry_run: bool, overwrite: bool) -> None:
     """Restore API keys and metadata from an encrypted backup."""
+    from keymaster.backup import BackupManager
+    
     try:
         backup_manager = BackupManager()
         
@@ -998,6 +1133,8 @@ def restore(backup_file: str | None, password: str | None, dry_run: bool, overwr
 @click.option("--stats", is_flag=True, default=False, help="Show rotation statistics")
 def rotation_status(days: int, stats: bool) -> None:
     """Show key rotation status and recommendations."""
+    from keymaster.rotation import KeyRotator, KeyRotationHistory
+    
     try:
         history = KeyRotationHistory()
         rotator = KeyRotator()
@@ -1043,6 +1180,7 @@ def rotation_status(days: int, stats: bool) -> None:
 def register_provider() -> None:
     """Register a new generic API provider."""
     from keymaster.providers import GenericProvider
+    from keymaster.audit import get_audit_logger
     
     # Get provider details
     display_name = click.prompt("Service name (e.g., OpenWeatherMap)")
@@ -1063,12 +1201,13 @@ def register_provider() -> None:
         click.echo(f"Test URL: {provider.test_url}")
     
     # Add audit logging
-    audit_logger = AuditLogger()
-    audit_logger.log_event(
+    audit_logger = get_audit_logger()
+    _log_audit_event(
+        audit_logger,
         event_type="register_provider",
         service=display_name.lower(),  # Log with lowercase name for consistency
         environment="global",  # Provider registration is global, not environment-specific
-        user=os.getenv("USER", "unknown"),
+        user=get_current_user(),
         additional_data={
             "display_name": display_name,  # Keep original case in metadata
             "description": description,
@@ -1,10 +1,25 @@
+import base64
+import copy
 import os
 import yaml
 import structlog
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Set, Tuple
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from keymaster.exceptions import ConfigurationError
 
 log = structlog.get_logger()
 
+# Use the libyaml C extension when PyYAML was built with it
+_YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Name of the system key used by ConfigManager.encrypt_data/decrypt_data
+CONFIG_ENCRYPTION_KEY_NAME = "config_encryption"
+
+# AES-GCM nonce size in bytes
+AESGCM_NONCE_SIZE = 12
+
 class ConfigManager:
     """
     Manages loading and writing the Keymaster configuration file.
@@ -12,6 +27,15 @@ class ConfigManager:
 
     CONFIG_FILENAME = "config.yaml"
 
+    # Last parsed config as (path, (st_mtime_ns, st_size), data); reused while the file is unchanged
+    _cache: Optional[Tuple[str, Tuple[int, int], Dict[str, Any]]] = None
+
+    # Config directories already created by this process
+    _created_dirs: Set[str] = set()
+
+    # AES-GCM cipher for encrypt_data/decrypt_data, created on first use
+    _cipher: Optional[AESGCM] = None
+
     @classmethod
     def _get_config_path(cls) -> str:
         """
@@ -19,19 +43,16 @@ class ConfigManager:
         """
         home_dir = os.path.expanduser("~")
         config_dir = os.path.join(home_dir, ".keymaster")
-        os.makedirs(config_dir, exist_ok=True)
+        if config_dir not in cls._created_dirs:
+            os.makedirs(config_dir, exist_ok=True)
+            cls._created_dirs.add(config_dir)
         return os.path.join(config_dir, cls.CONFIG_FILENAME)
 
-    @classmethod
-    def config_exists(cls) -> bool:
-        """
-        Check if the config file exists.
-        
-        Returns:
-            bool: True if the config file exists, False otherwise.
-        """
-        path = cls._get_config_path()
-        return os.path.exists(path)
+    @staticmethod
+    def _file_signature(path: str) -> Tuple[int, int]:
+        """Get the (st_mtime_ns, st_size) pair used to detect config file changes."""
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
 
     @classmethod
     def load_config(cls) -> Dict[str, Any]:
@@ -39,17 +60,28 @@ class ConfigManager:
         Load the config file from the .keymaster directory or return an empty dictionary if not found.
         """
         path = cls._get_config_path()
-        if not os.path.exists(path):
+        try:
+            signature = cls._file_signature(path)
+        except FileNotFoundError:
             log.info("No config file found; returning empty config.")
             return {}
+        
+        # Reuse the parsed config while the file is unchanged. Callers get a copy
+        # so they can modify it without affecting later loads.
+        if cls._cache is not None and cls._cache[:2] == (path, signature):
+            return copy.deepcopy(cls._cache[2])
+        
         try:
             with open(path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_YamlLoader)
                 log.info("Config file loaded successfully", path=path)
-                return data if data else {}
+                data = data if data else {}
         except Exception as e:
             log.error("Failed to load config file", error=str(e))
             return {}
+        
+        cls._cache = (path, signature, data)
+        return copy.deepcopy(data)
 
     @classmethod
     def write_config(cls, data: Dict[str, Any]) -> None:
@@ -59,24 +91,84 @@ class ConfigManager:
         path = cls._get_config_path()
         try:
             with open(path, "w", encoding="utf-8") as f:
-                yaml.safe_dump(data, f)
+                yaml.dump(data, f, Dumper=_YamlDumper)
+            cls._cache = (path, cls._file_signature(path), copy.deepcopy(data))
             log.info("Config file written successfully", path=path)
         except Exception as e:
+            cls._cache = None
             log.error("Failed to write config file", error=str(e))
 
+    @classmethod
+    def _get_cipher(cls) -> AESGCM:
+        """
+        Get the AES-GCM cipher, creating and storing its key in secure storage
+        the first time it is needed.
+
+        Returns:
+            The AESGCM cipher
+
+        Raises:
+            ConfigurationError: If the key cannot be retrieved or stored
+        """
+        if cls._cipher is not None:
+            return cls._cipher
+
+        # Import here to avoid circular imports
+        from keymaster.security import KeyStore
+
+        try:
+            key_str = KeyStore.get_system_key(CONFIG_ENCRYPTION_KEY_NAME)
+            if key_str:
+                key = base64.urlsafe_b64decode(key_str)
+            else:
+                key = AESGCM.generate_key(bit_length=128)
+                KeyStore.store_system_key(
+                    CONFIG_ENCRYPTION_KEY_NAME, base64.urlsafe_b64encode(key).decode()
+                )
+                log.info("Generated new config encryption key and stored securely")
+            cls._cipher = AESGCM(key)
+        except Exception as e:
+            log.error("Failed to get config encryption key", error=str(e))
+            raise ConfigurationError(f"Failed to get config encryption key: {e}")
+        return cls._cipher
+
     @classmethod
     def encrypt_data(cls, data: str) -> str:
         """
-        Placeholder for encryption logic. In a real scenario, you can use cryptography or a similar library.
+        Encrypt a string with AES-GCM using a key held in secure storage.
+
+        Args:
+            data: The plaintext to encrypt
+
+        Returns:
+            URL-safe base64 of the nonce followed by the ciphertext and tag
         """
-        return data[::-1]
+        nonce = os.urandom(AESGCM_NONCE_SIZE)
+        ciphertext = cls._get_cipher().encrypt(nonce, data.encode("utf-8"), None)
+        return base64.urlsafe_b64encode(nonce + ciphertext).decode("ascii")
 
     @classmethod
     def decrypt_data(cls, data: str) -> str:
         """
-        Placeholder for decryption logic. Mirror for the above demonstration function.
+        Decrypt a string produced by encrypt_data.
+
+        Args:
+            data: The encrypted value
+
+        Returns:
+            The decrypted plaintext
+
+        Raises:
+            ConfigurationError: If the value is malformed or fails authentication
         """
-        return data[::-1]
+        try:
+            raw = base64.urlsafe_b64decode(data)
+            plaintext = cls._get_cipher().decrypt(
+                raw[:AESGCM_NONCE_SIZE], raw[AESGCM_NONCE_SIZE:], None
+            )
+        except (InvalidTag, ValueError) as e:
+            raise ConfigurationError(f"Failed to decrypt config data: {str(e) or 'authentication failed'}")
+        return plaintext.decode("utf-8")
 
     @classmethod
     def config_exists(cls) -> bool:
@@ -6,19 +6,30 @@ Uses Python's built-in sqlite3 module from the standard library.
 import sqlite3
 import os
 from datetime import datetime, timezone
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 import structlog
 
 log = structlog.get_logger()
 
+# Maximum (service, environment) pairs looked up per metadata query. Each pair
+# binds two parameters, keeping every statement under the 999-variable limit of
+# older SQLite builds.
+METADATA_QUERY_BATCH_SIZE = 400
+
 class KeyDatabase:
     """Manages SQLite database for key metadata."""
     
+    # Database files whose schema and service names this process has already prepared
+    _initialized_paths: Set[str] = set()
+    
     def __init__(self):
         self.db_path = self._get_db_path()
-        self._init_db()
-        # Run service name normalization on startup
-        self.normalize_service_names()
+        # Create the schema and run service name normalization once per process
+        # rather than on every construction
+        if self.db_path not in KeyDatabase._initialized_paths:
+            self._init_db()
+            self.normalize_service_names()
+            KeyDatabase._initialized_paths.add(self.db_path)
         
     def _get_db_path(self) -> str:
         """Get the path to the SQLite database file."""
@@ -96,25 +107,61 @@ class KeyDatabase:
             row = cursor.fetchone()
             return dict(row) if row else None
             
-    def list_keys(self, service_name: Optional[str] = None) -> List[Tuple[str, str, datetime, str]]:
+    def get_keys_metadata(self, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], dict]:
+        """
+        Get metadata for several keys, querying up to METADATA_QUERY_BATCH_SIZE
+        pairs per statement over a single connection.
+        
+        Args:
+            keys: (service_name, environment) pairs to look up
+            
+        Returns:
+            Metadata for the keys that exist, keyed by lowercase (service_name, environment)
         """
-        List all keys or keys for a specific service.
+        wanted = list({(service.lower(), environment.lower()) for service, environment in keys})
+        if not wanted:
+            return {}
+        
+        metadata = {}
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            for start in range(0, len(wanted), METADATA_QUERY_BATCH_SIZE):
+                batch = wanted[start:start + METADATA_QUERY_BATCH_SIZE]
+                placeholders = ", ".join("(?, ?)" for _ in batch)
+                params = [value for pair in batch for value in pair]
+                cursor = conn.execute(f"""
+                    SELECT * FROM key_metadata 
+                    WHERE (LOWER(service_name), LOWER(environment)) IN (VALUES {placeholders})
+                """, params)
+                for row in cursor:
+                    metadata[(row["service_name"].lower(), row["environment"].lower())] = dict(row)
+        return metadata
+            
+    def list_keys(self,
+                  service_name: Optional[str] = None,
+                  environment: Optional[str] = None) -> List[Tuple[str, str, datetime, str]]:
+        """
+        List all keys, optionally only those for a service and/or environment.
+        Both filters are case-insensitive.
         Returns: List of (service_name, environment, updated_at, last_updated_by)
         """
+        conditions = []
+        params = []
+        if service_name:
+            conditions.append("LOWER(service_name) = LOWER(?)")
+            params.append(service_name)
+        if environment:
+            conditions.append("LOWER(environment) = LOWER(?)")
+            params.append(environment)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        
         with sqlite3.connect(self.db_path) as conn:
-            if service_name:
-                cursor = conn.execute("""
-                    SELECT service_name, environment, updated_at, last_updated_by 
-                    FROM key_metadata 
-                    WHERE LOWER(service_name) = LOWER(?)
-                    ORDER BY service_name, environment
-                """, (service_name,))
-            else:
-                cursor = conn.execute("""
-                    SELECT service_name, environment, updated_at, last_updated_by 
-                    FROM key_metadata 
-                    ORDER BY service_name, environment
-                """)
+            cursor = conn.execute(f"""
+                SELECT service_name, environment, updated_at, last_updated_by 
+                FROM key_metadata 
+                {where}
+                ORDER BY service_name, environment
+            """, params)
             return cursor.fetchall() 
 
     def normalize_service_names(self) -> None:
@@ -1,7 +1,6 @@
 import os
 import structlog
 from typing import Dict, Optional
-from dotenv import load_dotenv
 
 log = structlog.get_logger()
 
@@ -16,6 +15,9 @@ class EnvManager:
         Load environment variables from a .env file.
         :param filepath: Path to the .env file.
         """
+        # Imported here so commands that never read .env files skip loading python-dotenv
+        from dotenv import load_dotenv
+
         load_dotenv(dotenv_path=filepath)
         log.info("Environment variables loaded from file", filepath=filepath)
 
@@ -50,11 +52,10 @@ class EnvManager:
         :param prefix_filter: If provided, only return env vars starting with this prefix.
         :return: A dict of environment variable key-value pairs.
         """
-        env_vars = {}
-        for k, v in os.environ.items():
-            if prefix_filter and not k.startswith(prefix_filter):
-                continue
-            env_vars[k] = v
+        if prefix_filter:
+            env_vars = {k: v for k, v in os.environ.items() if k.startswith(prefix_filter)}
+        else:
+            env_vars = dict(os.environ)
         log.info("Listed environment variables", count=len(env_vars))
         return env_vars
 
@@ -5,6 +5,8 @@ This module provides a hierarchy of specific exceptions with clear error message
 and context to help users understand and resolve issues.
 """
 
+from collections import Counter
+
 
 class KeymasterError(Exception):
     """Base exception for all Keymaster errors."""
@@ -160,6 +162,9 @@ def _get_closest_matches(target: str, candidates: list, max_matches: int = 3) ->
         return []
     
     target_lower = target.lower()
+    # Occurrences of each target character, so the common characters of each
+    # candidate can be counted from a set intersection
+    target_counts = Counter(target_lower)
     
     # Calculate similarity scores
     scored_candidates = []
@@ -167,7 +172,7 @@ def _get_closest_matches(target: str, candidates: list, max_matches: int = 3) ->
         candidate_lower = candidate.lower()
         
         # Simple similarity: ratio of common characters to total length
-        common_chars = sum(1 for c in target_lower if c in candidate_lower)
+        common_chars = sum(target_counts[c] for c in target_counts.keys() & set(candidate_lower))
         max_len = max(len(target_lower), len(candidate_lower))
         similarity = common_chars / max_len if max_len > 0 else 0
         
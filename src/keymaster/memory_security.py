@@ -7,9 +7,11 @@ including secure memory clearing and context managers for temporary sensitive da
 
 import os
 import sys
+import hmac
 import ctypes
 import ctypes.util
-from typing import Any, Optional, Union
+import functools
+from typing import Any, Callable, Optional, Union
 from contextlib import contextmanager
 import structlog
 
@@ -17,16 +19,21 @@ log = structlog.get_logger()
 
 
 class SecureString:
-    """A string wrapper that automatically clears memory when destroyed."""
+    """
+    A string wrapper that automatically clears memory when destroyed.
+    
+    The value is held as UTF-8 in a bytearray, which can be zeroed in place;
+    get() and str() return a new str each call.
+    """
     
     def __init__(self, value: str):
-        self._value = value
+        self._value = bytearray(value.encode("utf-8"))
+        # Kept so len() never has to decode the secret into an immutable str
+        self._length = len(value)
         self._cleared = False
     
     def __str__(self) -> str:
-        if self._cleared:
-            raise ValueError("SecureString has been cleared")
-        return self._value
+        return self.get()
     
     def __repr__(self) -> str:
         return "<SecureString: [REDACTED]>"
@@ -34,27 +41,27 @@ class SecureString:
     def __len__(self) -> int:
         if self._cleared:
             return 0
-        return len(self._value)
+        return self._length
     
     def __del__(self):
         self.clear()
     
     def clear(self) -> None:
         """Securely clear the string from memory."""
-        if not self._cleared and self._value:
+        if not self._cleared:
             try:
                 secure_zero_memory(self._value)
             except Exception as e:
                 log.warning("Failed to securely clear memory", error=str(e))
             finally:
-                self._value = ""
+                self._value = bytearray()
                 self._cleared = True
     
     def get(self) -> str:
         """Get the string value."""
         if self._cleared:
             raise ValueError("SecureString has been cleared")
-        return self._value
+        return self._value.decode("utf-8")
     
     def is_cleared(self) -> bool:
         """Check if the string has been cleared."""
@@ -82,68 +89,75 @@ def secure_zero_memory(data: Union[str, bytes, bytearray]) -> None:
     it impossible to guarantee complete memory clearing, but this helps
     reduce the window of exposure.
     
+    Only mutable buffers can be cleared. str and bytes objects are immutable
+    and may be shared across the process, so they are left untouched; hold
+    secrets in a bytearray, SecureString or SecureBuffer instead.
+    
     Args:
         data: The sensitive data to clear from memory
     """
     try:
-        if isinstance(data, str):
-            _zero_string_memory(data)
-        elif isinstance(data, (bytes, bytearray)):
+        if isinstance(data, bytearray):
             _zero_bytes_memory(data)
+        elif isinstance(data, (str, bytes)):
+            log.debug("Immutable data cannot be zeroed; use SecureString or SecureBuffer",
+                      data_type=type(data).__name__)
     except Exception as e:
         log.warning("Failed to zero memory", error=str(e), data_type=type(data).__name__)
 
 
-def _zero_string_memory(s: str) -> None:
-    """Attempt to zero string memory using ctypes."""
-    if not s:
+def _zero_bytes_memory(data: bytearray) -> None:
+    """Zero a bytearray's buffer in place."""
+    if not data:
         return
-    
-    try:
-        # Get the memory address of the string
-        string_address = id(s)
-        
-        # Calculate the size of the string data
-        # Python string objects have a header, so we need to find the actual string data
-        if sys.platform == "win32":
-            # Windows implementation
-            _zero_memory_windows(string_address, len(s))
-        else:
-            # Unix-like systems
-            _zero_memory_unix(string_address, len(s))
-            
-    except Exception as e:
-        log.debug("String memory zeroing failed", error=str(e))
+    # Resolve the buffer address without copying and zero it with one call
+    buffer = (ctypes.c_char * len(data)).from_buffer(data)
+    if sys.platform == "win32":
+        _zero_memory_windows(ctypes.addressof(buffer), len(data))
+    else:
+        _zero_memory_unix(ctypes.addressof(buffer), len(data))
 
 
-def _zero_bytes_memory(data: Union[bytes, bytearray]) -> None:
-    """Zero bytes/bytearray memory."""
-    if isinstance(data, bytearray):
-        # bytearray is mutable, so we can directly modify it
-        for i in range(len(data)):
-            data[i] = 0
-    else:
-        # bytes is immutable, try to zero the underlying memory
-        try:
-            data_address = id(data)
-            if sys.platform == "win32":
-                _zero_memory_windows(data_address, len(data))
-            else:
-                _zero_memory_unix(data_address, len(data))
-        except Exception as e:
-            log.debug("Bytes memory zeroing failed", error=str(e))
+@functools.cache
+def _windows_secure_zero() -> Optional[Callable[..., Any]]:
+    """Look up the kernel32 secure zeroing function once, or None if unavailable."""
+    kernel32 = ctypes.windll.kernel32
+    # Use SecureZeroMemory if available (Windows Vista+), else RtlSecureZeroMemory
+    secure_zero = (
+        getattr(kernel32, 'SecureZeroMemory', None)
+        or getattr(kernel32, 'RtlSecureZeroMemory', None)
+    )
+    if secure_zero is not None:
+        secure_zero.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        secure_zero.restype = None
+    return secure_zero
+
+
+@functools.cache
+def _explicit_bzero() -> Optional[Callable[..., Any]]:
+    """Look up libc's explicit_bzero once, or None if unavailable."""
+    libc_name = ctypes.util.find_library("c")
+    if not libc_name:
+        return None
+    try:
+        libc = ctypes.CDLL(libc_name)
+    except OSError:
+        return None
+    explicit_bzero = getattr(libc, 'explicit_bzero', None)
+    if explicit_bzero is not None:
+        explicit_bzero.argtypes = [ctypes.c_void_p, ctypes.c_size_t]
+        explicit_bzero.restype = None
+    return explicit_bzero
 
 
 def _zero_memory_windows(address: int, size: int) -> None:
     """Zero memory on Windows using kernel32."""
     try:
-        kernel32 = ctypes.windll.kernel32
-        # Use SecureZeroMemory if available (Windows Vista+)
-        if hasattr(kernel32, 'SecureZeroMemory'):
-            kernel32.SecureZeroMemory(ctypes.c_void_p(address), ctypes.c_size_t(size))
+        secure_zero = _windows_secure_zero()
+        if secure_zero is not None:
+            secure_zero(address, size)
         else:
-            # Fallback to RtlSecureZeroMemory
-            kernel32.RtlSecureZeroMemory(ctypes.c_void_p(address), ctypes.c_size_t(size))
+            _volatile_memset(address, size)
     except Exception as e:
         log.debug("Windows memory zeroing failed", error=str(e))
 
@@ -151,13 +165,11 @@ def _zero_memory_windows(address: int, size: int) -> None:
 def _zero_memory_unix(address: int, size: int) -> None:
     """Zero memory on Unix-like systems."""
     try:
-        # Try to use explicit_bzero if available (BSD/macOS)
-        libc_name = ctypes.util.find_library("c")
-        if libc_name:
-            libc = ctypes.CDLL(libc_name)
-            if hasattr(libc, 'explicit_bzero'):
-                libc.explicit_bzero(ctypes.c_void_p(address), ctypes.c_size_t(size))
-                return
+        # Try to use explicit_bzero if available (glibc, BSD)
+        explicit_bzero = _explicit_bzero()
+        if explicit_bzero is not None:
+            explicit_bzero(address, size)
+            return
         
         # Fallback to memset with volatile
         _volatile_memset(address, size)
@@ -169,10 +181,8 @@ def _zero_memory_unix(address: int, size: int) -> None:
 def _volatile_memset(address: int, size: int) -> None:
     """Volatile memset to prevent compiler optimization."""
     try:
-        # Create a volatile pointer and zero the memory
-        ptr = ctypes.c_char_p(address)
-        for i in range(size):
-            ptr[i] = b'\x00'
+        # A foreign call the compiler cannot see through, so it is never elided
+        ctypes.memset(address, 0, size)
     except Exception as e:
         log.debug("Volatile memset failed", error=str(e))
 
@@ -268,11 +278,5 @@ def secure_compare(a: str, b: str) -> bool:
     Returns:
         True if strings are equal, False otherwise
     """
-    if len(a) != len(b):
-        return False
-    
-    result = 0
-    for x, y in zip(a, b):
-        result |= ord(x) ^ ord(y)
-    
-    return result == 0
\ No newline at end of file
+    # compare_digest only accepts ASCII str, so compare the UTF-8 encodings
+    return hmac.compare_digest(a.encode("utf-8"), b.encode("utf-8"))
\ No newline at end of file
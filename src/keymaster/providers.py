@@ -1,13 +1,79 @@
-from abc import ABC, abstractmethod
 import os
-from typing import Any, Dict, ClassVar, Optional
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 import structlog
-import requests
 from dataclasses import dataclass, asdict
+import hashlib
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 log = structlog.get_logger()
 
+# (connect, read) seconds to wait for a provider API when testing a key
+PROVIDER_TEST_TIMEOUT = (3.05, 10)
+
+# Connection pool sizing for the shared HTTP session: one pool per provider
+# host, with enough connections for keys tested in parallel
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 8
+
+# Retries for connection errors and transient gateway responses. POST requests
+# are only retried when the connection could not be established.
+HTTP_RETRY_TOTAL = 3
+HTTP_RETRY_BACKOFF = 0.3
+HTTP_RETRY_STATUSES = (502, 503, 504)
+
+# Maximum number of keys tested against provider APIs at once; kept within
+# HTTP_POOL_MAXSIZE so concurrent tests do not open extra connections
+KEY_TEST_MAX_WORKERS = 8
+
+# Seconds a successful key validation is reused before the provider is asked again
+VALIDATION_CACHE_TTL = 300
+
+# Maximum number of successful validations kept in memory
+VALIDATION_CACHE_MAXSIZE = 256
+
+# Shared HTTP session, created on first use so commands that never test keys
+# do not import requests
+_session = None
+_session_lock = threading.Lock()
+
+def _get_session():
+    """
+    Get the HTTP session shared by all provider key tests.
+    
+    Reusing one session keeps connections alive, so repeated tests against the
+    same provider skip the TCP and TLS handshakes.
+    
+    Returns:
+        The shared requests.Session
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                from urllib3.util.retry import Retry
+                
+                retries = Retry(
+                    total=HTTP_RETRY_TOTAL,
+                    backoff_factor=HTTP_RETRY_BACKOFF,
+                    status_forcelist=HTTP_RETRY_STATUSES,
+                    # Return the last response so callers still get an HTTPError
+                    raise_on_status=False
+                )
+                session = requests.Session()
+                session.mount("https://", HTTPAdapter(
+                    pool_connections=HTTP_POOL_CONNECTIONS,
+                    pool_maxsize=HTTP_POOL_MAXSIZE,
+                    max_retries=retries
+                ))
+                _session = session
+    return _session
+
 def _get_providers_file() -> str:
     """Get the path to the providers JSON file."""
     home_dir = os.path.expanduser("~")
@@ -25,8 +91,10 @@ def _load_generic_providers() -> None:
         with open(providers_file, 'r') as f:
             providers_data = json.load(f)
             
+        # Register directly rather than via GenericProvider.create, which would
+        # rewrite the file we are reading once per provider
         for provider_data in providers_data:
-            GenericProvider.create(**provider_data)
+            _register_provider(GenericProvider(**provider_data))
     except Exception as e:
         log.error("Failed to load generic providers", error=str(e))
 
@@ -121,7 +189,7 @@ class GenericProvider(BaseProvider):
         else:
             url += f"?appid={api_key}"
             
-        response = requests.get(url)
+        response = _get_session().get(url, timeout=PROVIDER_TEST_TIMEOUT)
         response.raise_for_status()
         
         return {
@@ -135,16 +203,20 @@ class OpenAIProvider(BaseProvider):
     description = "OpenAI's GPT models and other AI services including DALL-E and embeddings"
     api_url = "https://api.openai.com/v1/chat/completions"
     
+    # Request body sent when testing a key; shared by all calls, never mutated
+    _TEST_PAYLOAD = {
+        "model": "gpt-3.5-turbo",
+        "messages": [{"role": "user", "content": "Say 'test' if you can read this."}],
+        "max_tokens": 10
+    }
+    
     @classmethod
     def test_key(cls, api_key: str) -> dict:
-        response = requests.post(
+        response = _get_session().post(
             cls.api_url,
             headers={"Authorization": f"Bearer {api_key}"},
-            json={
-                "model": "gpt-3.5-turbo",
-                "messages": [{"role": "user", "content": "Say 'test' if you can read this."}],
-                "max_tokens": 10
-            }
+            json=cls._TEST_PAYLOAD,
+            timeout=PROVIDER_TEST_TIMEOUT
         )
         response.raise_for_status()
         return response.json()
@@ -154,19 +226,23 @@ class AnthropicProvider(BaseProvider):
     description = "Anthropic's Claude models for natural language understanding and generation"
     api_url = "https://api.anthropic.com/v1/messages"
     
+    # Headers sent with every key test, apart from the key itself
+    _BASE_HEADERS = {"anthropic-version": "2023-06-01"}
+    
+    # Request body sent when testing a key; shared by all calls, never mutated
+    _TEST_PAYLOAD = {
+        "model": "claude-3-opus-20240229",
+        "max_tokens": 10,
+        "messages": [{"role": "user", "content": "Say 'test' if you can read this."}]
+    }
+    
     @classmethod
     def test_key(cls, api_key: str) -> dict:
-        response = requests.post(
+        response = _get_session().post(
             cls.api_url,
-            headers={
-                "x-api-key": api_key,
-                "anthropic-version": "2023-06-01"
-            },
-            json={
-                "model": "claude-3-opus-20240229",
-                "max_tokens": 10,
-                "messages": [{"role": "user", "content": "Say 'test' if you can read this."}]
-            }
+            headers={**cls._BASE_HEADERS, "x-api-key": api_key},
+            json=cls._TEST_PAYLOAD,
+            timeout=PROVIDER_TEST_TIMEOUT
         )
         response.raise_for_status()
         return response.json()
@@ -178,9 +254,10 @@ class StabilityProvider(BaseProvider):
     
     @classmethod
     def test_key(cls, api_key: str) -> dict:
-        response = requests.get(
+        response = _get_session().get(
             cls.api_url,
-            headers={"Authorization": f"Bearer {api_key}"}
+            headers={"Authorization": f"Bearer {api_key}"},
+            timeout=PROVIDER_TEST_TIMEOUT
         )
         response.raise_for_status()
         return response.json()
@@ -190,40 +267,162 @@ class DeepSeekProvider(BaseProvider):
     description = "DeepSeek's language models and AI services"
     api_url = "https://api.deepseek.com/v1/chat/completions"
     
+    # Request body sent when testing a key; shared by all calls, never mutated
+    _TEST_PAYLOAD = {
+        "model": "deepseek-chat",
+        "messages": [{"role": "user", "content": "Say 'test' if you can read this."}],
+        "max_tokens": 10
+    }
+    
     @classmethod
     def test_key(cls, api_key: str) -> dict:
-        response = requests.post(
+        response = _get_session().post(
             cls.api_url,
             headers={"Authorization": f"Bearer {api_key}"},
-            json={
-                "model": "deepseek-chat",
-                "messages": [{"role": "user", "content": "Say 'test' if you can read this."}],
-                "max_tokens": 10
-            }
+            json=cls._TEST_PAYLOAD,
+            timeout=PROVIDER_TEST_TIMEOUT
         )
         response.raise_for_status()
         return response.json()
 
+# Built-in provider classes, registered at import and on registry reset
+BUILTIN_PROVIDERS = (OpenAIProvider, AnthropicProvider, StabilityProvider, DeepSeekProvider)
+
 # Dictionary to store all providers
 _providers: Dict[str, BaseProvider] = {}
 
+# Read-only live view of the registry handed out by get_providers()
+_providers_view: Mapping[str, BaseProvider] = MappingProxyType(_providers)
+
 def _register_provider(provider: BaseProvider) -> None:
     """Register a provider in the global provider dictionary."""
     _providers[provider.service_name.lower()] = provider
 
 # Register built-in providers
-_register_provider(OpenAIProvider())
-_register_provider(AnthropicProvider())
-_register_provider(StabilityProvider())
-_register_provider(DeepSeekProvider())
+for _provider_class in BUILTIN_PROVIDERS:
+    _register_provider(_provider_class())
 
 # Load any saved generic providers
 _load_generic_providers()
 
-def get_providers() -> Dict[str, BaseProvider]:
-    """Get all registered providers."""
-    return _providers
+def get_providers() -> Mapping[str, BaseProvider]:
+    """
+    Get all registered providers.
+    
+    Returns a read-only view of the registry rather than a copy, so it costs
+    nothing per call and always reflects later registrations.
+    """
+    return _providers_view
 
 def get_provider_by_name(name: str) -> Optional[BaseProvider]:
     """Get a provider by name (case-insensitive)."""
-    return _providers.get(name.lower()) 
\ No newline at end of file
+    return _providers.get(name.lower())
+
+# Successful validations by (service, SHA-256 of key, URL) as (expiry, result).
+# Keys are hashed so raw secrets are never held as cache keys.
+_validation_cache: Dict[Tuple[Any, str, Any], Tuple[float, Any]] = {}
+_validation_cache_lock = threading.Lock()
+
+def _hash_key(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+def validate_provider_key(provider: BaseProvider, api_key: str) -> Any:
+    """
+    Test an API key with its provider, reusing a recent successful result.
+    
+    Only successful validations are cached, for VALIDATION_CACHE_TTL seconds,
+    so a failing key is always re-tested.
+    
+    Args:
+        provider: The provider to test the key against
+        api_key: The API key to test
+        
+    Returns:
+        The provider's test_key result
+        
+    Raises:
+        Exception: Whatever the provider's test_key raises for an invalid key
+    """
+    url = getattr(provider, "test_url", None) or provider.api_url
+    cache_key = (provider.service_name, _hash_key(api_key), url)
+    now = time.monotonic()
+    
+    with _validation_cache_lock:
+        cached = _validation_cache.get(cache_key)
+        if cached is not None and cached[0] > now:
+            return cached[1]
+    
+    result = provider.test_key(api_key)
+    
+    # A generic provider without a test URL did not actually validate anything
+    if isinstance(result, dict) and result.get("status") == "untested":
+        return result
+    
+    with _validation_cache_lock:
+        if len(_validation_cache) >= VALIDATION_CACHE_MAXSIZE:
+            for key in [k for k, (expiry, _) in _validation_cache.items() if expiry <= now]:
+                del _validation_cache[key]
+            if len(_validation_cache) >= VALIDATION_CACHE_MAXSIZE:
+                # Drop the oldest entry
+                del _validation_cache[next(iter(_validation_cache))]
+        _validation_cache[cache_key] = (now + VALIDATION_CACHE_TTL, result)
+    return result
+
+def validate_keys_bulk(items: List[Tuple[BaseProvider, str]]) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    Test several API keys concurrently.
+    
+    Key tests spend nearly all their time waiting on the network, so running
+    them in parallel makes testing N keys take about as long as the slowest one.
+    
+    Args:
+        items: (provider, api_key) pairs to test
+        
+    Returns:
+        A (result, error) pair for each item, in the same order as items.
+        error is None when the key is valid and carries no traceback.
+    """
+    def _validate(item: Tuple[BaseProvider, str]) -> Tuple[Any, Optional[Exception]]:
+        provider, api_key = item
+        try:
+            return validate_provider_key(provider, api_key), None
+        except Exception as e:
+            # Failures are reported by message only. Dropping the traceback frees
+            # the request frames, and the key strings in them, right away instead
+            # of keeping them alive until every result has been reported.
+            return None, e.with_traceback(None)
+    
+    if len(items) <= 1:
+        return [_validate(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(KEY_TEST_MAX_WORKERS, len(items))) as executor:
+        return list(executor.map(_validate, items))
+
+def invalidate_validation(api_key: str) -> None:
+    """
+    Forget cached successful validations of an API key, e.g. after it is rotated out.
+    
+    Args:
+        api_key: The API key whose validations should be dropped
+    """
+    key_hash = _hash_key(api_key)
+    with _validation_cache_lock:
+        for key in [k for k in _validation_cache if k[1] == key_hash]:
+            del _validation_cache[key]
+
+def invalidate_service_validations(service_name: str) -> None:
+    """
+    Forget cached successful validations of every key for a service, e.g. after
+    one of its keys is removed without being read.
+    
+    Args:
+        service_name: The service whose validations should be dropped (case-insensitive)
+    """
+    service_lower = service_name.lower()
+    with _validation_cache_lock:
+        for key in [k for k in _validation_cache if k[0].lower() == service_lower]:
+            del _validation_cache[key]
+
+def clear_validation_cache() -> None:
+    """Forget all cached key validations."""
+    with _validation_cache_lock:
+        _validation_cache.clear()
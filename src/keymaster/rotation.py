@@ -14,8 +14,9 @@ import structlog
 
 from keymaster.security import KeyStore
 from keymaster.backup import BackupManager
-from keymaster.audit import AuditLogger
-from keymaster.providers import get_provider_by_name
+from keymaster.audit import get_audit_logger
+from keymaster.providers import get_provider_by_name, validate_provider_key, invalidate_validation
+from keymaster.utils import get_current_user
 from keymaster.exceptions import KeymasterError
 from keymaster.memory_security import secure_temp_string, secure_zero_memory
 
@@ -84,7 +85,7 @@ class KeyRotationHistory:
         rotation_record = {
             "timestamp": datetime.now().isoformat(),
             "success": success,
-            "user": os.getenv("USER", "unknown"),
+            "user": get_current_user(),
             "backup_path": backup_path,
             "error_message": error_message
         }
@@ -182,7 +183,7 @@ class KeyRotator:
     
     def __init__(self):
         self.backup_manager = BackupManager()
-        self.audit_logger = AuditLogger()
+        self.audit_logger = get_audit_logger()
         self.history = KeyRotationHistory()
     
     def rotate_key(
@@ -245,10 +246,16 @@ class KeyRotator:
             "rotation_successful": False
         }
         
+        # Step 1: Test new key if requested, before any backup work so an
+        # invalid key fails fast
+        if test_key:
+            self._test_new_key(service, secure_new_key.get())
+            rotation_result["key_tested"] = True
+        
         # Get current key
         old_key = KeyStore.get_key(service, environment)
         
-        # Step 1: Create backup if requested
+        # Step 2: Create backup if requested
         backup_path = None
         if create_backup and old_key:
             backup_path = self._create_pre_rotation_backup(
@@ -257,11 +264,6 @@ class KeyRotator:
             rotation_result["backup_created"] = True
             rotation_result["backup_path"] = backup_path
         
-        # Step 2: Test new key if requested
-        if test_key:
-            self._test_new_key(service, secure_new_key.get())
-            rotation_result["key_tested"] = True
-        
         # Step 3: Create timestamped backup of old key in keystore
         if old_key:
             self._backup_old_key_in_keystore(service, environment, old_key)
@@ -270,6 +272,9 @@ class KeyRotator:
         # Step 4: Store new key
         KeyStore.store_key(service, environment, secure_new_key.get())
         rotation_result["rotation_successful"] = True
+        if old_key:
+            # The old key may be revoked next, so never report it valid from cache
+            invalidate_validation(old_key)
         
         # Step 5: Record rotation in history
         self.history.record_rotation(
@@ -281,7 +286,7 @@ class KeyRotator:
             event_type="key_rotation_enhanced",
             service=service,
             environment=environment,
-            user=os.getenv("USER", "unknown"),
+            user=get_current_user(),
             additional_data={
                 "backup_created": rotation_result["backup_created"],
                 "key_tested": rotation_result["key_tested"],
@@ -331,7 +336,7 @@ class KeyRotator:
             raise RotationError(f"Provider not found for service: {service}", service)
         
         try:
-            provider.test_key(new_key)
+            validate_provider_key(provider, new_key)
         except Exception as e:
             raise RotationError(f"New key validation failed: {str(e)}", service)
     
@@ -399,7 +404,7 @@ class KeyRotator:
                 event_type="key_rotation_rollback",
                 service=service,
                 environment=environment,
-                user=os.getenv("USER", "unknown"),
+                user=get_current_user(),
                 additional_data={
                     "backup_path": backup_path,
                     "restore_result": restore_result
@@ -1,15 +1,22 @@
 import keyring
 import structlog
-from typing import List, Tuple, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Tuple, Optional
 from datetime import datetime
 import os
+import secrets
+import threading
 from keymaster.db import KeyDatabase
 import sys
 from keyring.errors import KeyringError
 from keymaster.exceptions import KeyringError as KeymasterKeyringError, StorageError
+from keymaster.utils import get_current_user
 
 log = structlog.get_logger()
 
+# Keyring service and user name for the self_test probe entry
+SELF_TEST_SERVICE = "keymaster-self-test"
+
 class KeyStore:
     """
     Provides secure storage and retrieval of API keys using the system's secure storage.
@@ -19,12 +26,76 @@ class KeyStore:
     - Linux: SecretService (GNOME Keyring/KWallet)
     
     Falls back to an encrypted file if no secure backend is available.
+    
+    Set KEYMASTER_CACHE_SECRETS=1 to keep retrieved keys in memory for the rest
+    of the process, so repeated lookups skip the secure storage round-trip.
     """
     
+    # Retrieved keys by (service, environment); only used when caching is enabled
+    _key_cache: Dict[Tuple[str, str], str] = {}
+    
+    # Unfiltered list_keys() result, kept while a cached_listing() block is active
+    _listing: Optional[List[Tuple[str, str, str, str]]] = None
+    _listing_cache_depth: int = 0
+    
+    # Set once a secure backend has been selected and checked for this process
+    _backend_verified: bool = False
+    _backend_lock = threading.Lock()
+    
+    @staticmethod
+    def _cache_enabled() -> bool:
+        """Whether retrieved keys may be cached in process memory."""
+        return os.getenv("KEYMASTER_CACHE_SECRETS") == "1"
+    
+    @staticmethod
+    def _cache_key(service: str, environment: str) -> Tuple[str, str]:
+        return service.lower(), environment.lower()
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Drop all keys cached by get_key."""
+        cls._key_cache.clear()
+    
+    @classmethod
+    @contextmanager
+    def cached_listing(cls) -> Iterator[None]:
+        """
+        Answer list_keys() calls from a single metadata query for the duration of the block.
+        
+        A CLI command and the selection helpers it uses each list the stored keys;
+        inside this block they share one query. The listing is dropped whenever a
+        key is stored or removed, and when the outermost block exits.
+        """
+        cls._listing_cache_depth += 1
+        try:
+            yield
+        finally:
+            cls._listing_cache_depth -= 1
+            if not cls._listing_cache_depth:
+                cls._listing = None
+    
     @classmethod
     def _verify_backend(cls) -> None:
         """
         Verify that a secure backend is being used.
+        
+        The backend is selected and checked on the first call only; later calls
+        in the same process return immediately. A failed check is not remembered.
+        
+        Raises:
+            KeyringError: If no secure backend is available
+        """
+        if cls._backend_verified:
+            return
+        with cls._backend_lock:
+            if not cls._backend_verified:
+                cls._check_backend()
+                cls._backend_verified = True
+    
+    @classmethod
+    def _check_backend(cls) -> None:
+        """
+        Select the most secure backend for the platform and check that it is secure.
         Raises KeyringError if no secure backend is available.
         """
         # Try to set the most secure backend for the current platform
@@ -97,6 +168,8 @@ class KeyStore:
             KeyringError: If no secure backend is available
         """
         cls._verify_backend()
+        cls._key_cache.pop(cls._cache_key(service, environment), None)
+        cls._listing = None
         
         # Always use lowercase for storage
         service_lower = service.lower()
@@ -109,7 +182,7 @@ class KeyStore:
             service_name=service_lower,  # Store as lowercase
             environment=environment,
             keychain_service_name=keyring_service,
-            user=os.getlogin()
+            user=get_current_user()
         )
         
         log.info("Stored key in secure storage", 
@@ -132,6 +205,12 @@ class KeyStore:
         Raises:
             KeyringError: If no secure backend is available
         """
+        cache_enabled = cls._cache_enabled()
+        if cache_enabled:
+            cached = cls._key_cache.get(cls._cache_key(service, environment))
+            if cached is not None:
+                return cached
+        
         cls._verify_backend()
         
         # First check if key exists in metadata
@@ -153,10 +232,61 @@ class KeyStore:
                     service=service, 
                     environment=environment,
                     backend=keyring.get_keyring().__class__.__name__)
+            if cache_enabled:
+                cls._key_cache[cls._cache_key(service, environment)] = key
         return key
 
     @classmethod
-    def remove_key(cls, service: str, environment: str) -> None:
+    def get_keys(cls, keys: List[Tuple[str, str]]) -> Dict[Tuple[str, str], Optional[str]]:
+        """
+        Retrieve several API keys, reading their metadata with a single query.
+        
+        Args:
+            keys: (service, environment) pairs to retrieve
+            
+        Returns:
+            The API key, or None if not found, for each requested pair
+            
+        Raises:
+            KeyringError: If no secure backend is available
+        """
+        cache_enabled = cls._cache_enabled()
+        results: Dict[Tuple[str, str], Optional[str]] = {}
+        missing = []
+        for pair in keys:
+            cached = cls._key_cache.get(cls._cache_key(*pair)) if cache_enabled else None
+            if cached is not None:
+                results[pair] = cached
+            else:
+                missing.append(pair)
+        if not missing:
+            return results
+        
+        cls._verify_backend()
+        metadata = KeyDatabase().get_keys_metadata(missing)
+        
+        for service, environment in missing:
+            key_metadata = metadata.get(cls._cache_key(service, environment))
+            if not key_metadata:
+                log.warning("Key metadata not found", service=service, environment=environment)
+                results[(service, environment)] = None
+                continue
+            
+            key = keyring.get_password(
+                key_metadata['keychain_service_name'],
+                environment.lower()
+            )
+            if key is None:
+                log.warning("API key not found", service=service, environment=environment)
+            elif cache_enabled:
+                cls._key_cache[cls._cache_key(service, environment)] = key
+            results[(service, environment)] = key
+        
+        log.info("Retrieved keys from secure storage", count=len(missing))
+        return results
+
+    @classmethod
+    def remove_key(cls, service: str, environment: str) -> bool:
         """
         Remove an API key from the system's secure storage.
         
@@ -164,17 +294,22 @@ class KeyStore:
             service: Service name (e.g., OpenAI)
             environment: Environment name (e.g., dev, prod)
             
+        Returns:
+            True if a key was deleted from secure storage, False if none was found
+            
         Raises:
             KeyringError: If no secure backend is available
         """
         cls._verify_backend()
+        cls._key_cache.pop(cls._cache_key(service, environment), None)
+        cls._listing = None
         
         # First check if key exists in metadata
         db = KeyDatabase()
         metadata = db.get_key_metadata(service, environment)
         if not metadata:
             log.warning("Key metadata not found", service=service, environment=environment)
-            return
+            return False
             
         try:
             keyring.delete_password(
@@ -189,35 +324,57 @@ class KeyStore:
                     service=service, 
                     environment=environment,
                     backend=keyring.get_keyring().__class__.__name__)
+            return True
         except keyring.errors.PasswordDeleteError:
             log.warning("Key not found in secure storage", 
                        service=service, 
                        environment=environment)
+            return False
 
     @classmethod
-    def list_keys(cls, service: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
+    def list_keys(cls,
+                  service: Optional[str] = None,
+                  environment: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
         """
         List all stored API keys (service and environment names only).
         
         Args:
             service: Optional service name to filter by
+            environment: Optional environment name to filter by
             
         Returns:
-            List of (service, environment, updated_at, last_updated_by) tuples using canonical service names
+            List of (service, environment, updated_at, last_updated_by) tuples using canonical service names,
+            ordered by service and environment
             
         Raises:
             KeyringError: If no secure backend is available
         """
         cls._verify_backend()
         
-        db = KeyDatabase()
-        keys = db.list_keys(service)
+        if not cls._listing_cache_depth:
+            return cls._load_keys(service, environment)
         
-        # Convert service names to canonical form using providers
-        from keymaster.providers import get_provider_by_name, _load_generic_providers
+        if cls._listing is None:
+            cls._listing = cls._load_keys()
+        service_lower = service.lower() if service else None
+        environment_lower = environment.lower() if environment else None
+        return [
+            (s, e, u, b) for s, e, u, b in cls._listing
+            if (service_lower is None or s.lower() == service_lower)
+            and (environment_lower is None or e.lower() == environment_lower)
+        ]
+    
+    @classmethod
+    def _load_keys(cls,
+                   service: Optional[str] = None,
+                   environment: Optional[str] = None) -> List[Tuple[str, str, str, str]]:
+        """Query key metadata and convert service names to their canonical form."""
+        db = KeyDatabase()
+        keys = db.list_keys(service, environment)
         
-        # Ensure generic providers are loaded
-        _load_generic_providers()
+        # Convert service names to canonical form using providers. Saved generic
+        # providers are registered when keymaster.providers is first imported.
+        from keymaster.providers import get_provider_by_name
         
         normalized_keys = []
         for svc, env, updated_at, updated_by in keys:
@@ -265,9 +422,37 @@ class KeyStore:
             environment: Environment name
         """
         cls._verify_backend()
+        cls._key_cache.pop(cls._cache_key(service, environment), None)
+        cls._listing = None
         db = KeyDatabase()
         db.remove_key(service, environment)
 
+    @classmethod
+    def self_test(cls) -> bool:
+        """
+        Check that secure storage can store, read back and delete a value.
+        
+        Uses the keyring directly rather than store_key/get_key/remove_key, so
+        no key metadata is written and the probe costs only three keyring calls.
+        
+        Returns:
+            True if the value read back matches the value stored
+            
+        Raises:
+            KeyringError: If no secure backend is available
+        """
+        cls._verify_backend()
+        
+        probe = secrets.token_hex(16)
+        keyring.set_password(SELF_TEST_SERVICE, SELF_TEST_SERVICE, probe)
+        try:
+            return keyring.get_password(SELF_TEST_SERVICE, SELF_TEST_SERVICE) == probe
+        finally:
+            try:
+                keyring.delete_password(SELF_TEST_SERVICE, SELF_TEST_SERVICE)
+            except keyring.errors.PasswordDeleteError:
+                log.warning("Self-test entry not found in secure storage")
+
     @classmethod
     def get_system_key(cls, key_name: str) -> Optional[str]:
         """
@@ -23,13 +23,13 @@ class ServiceEnvironmentSelector:
             
         # Get unique services that have stored keys and map to canonical names
         stored_service_names = set(service.lower() for service, _, _, _ in stored_keys)
-        available_providers = {
-            name: provider 
-            for name, provider in get_providers().items()
-            if name in stored_service_names
-        }
+        providers = get_providers()
         
-        return {provider.service_name for provider in available_providers.values()}
+        return {
+            provider.service_name
+            for provider in map(providers.get, stored_service_names)
+            if provider is not None
+        }
     
     @staticmethod
     def get_environments_for_service(service_name: str) -> List[str]:
@@ -39,20 +39,23 @@ class ServiceEnvironmentSelector:
             return []
             
         # Get environments that actually have stored keys for this service
+        service_lower = service_name.lower()
         available_environments = sorted(set(
             env for svc, env, _, _ in stored_keys 
-            if svc.lower() == service_name.lower()
+            if svc.lower() == service_lower
         ))
         
         return available_environments
     
     @staticmethod
-    def select_service_with_keys(prompt_message: str = "Select service:") -> Optional[str]:
+    def select_service_with_keys(prompt_message: str = "Select service:", auto_select: bool = True) -> Optional[str]:
         """
         Prompt user to select a service that has stored keys.
         
         Args:
             prompt_message: Custom prompt message
+            auto_select: Whether to pick the only service without prompting.
+                Destructive commands pass False so the user always chooses.
             
         Returns:
             Selected canonical service name, or None if no services available
@@ -60,6 +63,12 @@ class ServiceEnvironmentSelector:
         services = ServiceEnvironmentSelector.get_services_with_keys()
         if not services:
             return None
+        
+        # Nothing to choose between; skip the prompt
+        if len(services) == 1 and auto_select:
+            service = next(iter(services))
+            print(f"\nUsing {service} (only service with stored keys)")
+            return service
             
         service, _ = prompt_selection(
             prompt_message,
@@ -72,7 +81,8 @@ class ServiceEnvironmentSelector:
     def select_environment_for_service(
         service_name: str, 
         prompt_message: Optional[str] = None,
-        allow_new: bool = False
+        allow_new: bool = False,
+        auto_select: bool = True
     ) -> Optional[str]:
         """
         Prompt user to select an environment for a specific service.
@@ -81,6 +91,8 @@ class ServiceEnvironmentSelector:
             service_name: The service to select environment for
             prompt_message: Custom prompt message (auto-generated if None)
             allow_new: Whether to allow creating new environments
+            auto_select: Whether to pick the only environment without prompting.
+                Destructive commands pass False so the user always chooses.
             
         Returns:
             Selected environment name, or None if no environments available
@@ -89,6 +101,11 @@ class ServiceEnvironmentSelector:
         if not environments and not allow_new:
             return None
             
+        # Nothing to choose between; skip the prompt
+        if len(environments) == 1 and not allow_new and auto_select:
+            print(f"\nUsing {environments[0]} (only environment for {service_name})")
+            return environments[0]
+            
         if prompt_message is None:
             prompt_message = f"Select environment for {service_name}:"
             
@@ -0,0 +1,54 @@
+"""
+JSON serialization helpers for Keymaster.
+
+Uses orjson (C-accelerated, bytes in/out) when it is installed and falls back
+to the standard library json module otherwise. Install with
+``pip install keymaster[speedups]`` to enable orjson.
+"""
+
+import json
+from typing import Any, Callable, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional dependency
+    orjson = None
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Serialize an object to compact UTF-8 encoded JSON.
+
+    Args:
+        obj: The object to serialize
+        default: Optional callable used for objects that are not JSON serializable
+
+    Returns:
+        The JSON document as bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        obj, default=default, separators=(',', ':'), ensure_ascii=False
+    ).encode("utf-8")
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    """
+    Deserialize a JSON document.
+
+    Args:
+        data: The JSON document as bytes, a bytes-like object or str
+
+    Returns:
+        The deserialized object
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        # json.loads does not accept memoryview
+        data = bytes(data)
+    return json.loads(data)
@@ -1,23 +1,48 @@
-from typing import List, Optional, Tuple
+import functools
+import getpass
+import os
+from typing import Optional, Sequence, Tuple
 from keymaster.providers import get_providers
 
-def prompt_selection(prompt: str, options: List[str], allow_new: bool = False, show_descriptions: bool = False) -> Tuple[str, bool]:
+
+@functools.cache
+def get_current_user() -> str:
+    """
+    Get the name of the user running Keymaster, for audit records.
+    
+    The result is cached for the life of the process. Unlike os.getlogin(),
+    this does not need a controlling terminal, so it also works under nohup,
+    cron and CI.
+    
+    Returns:
+        The user name, or "unknown" if it cannot be determined
+    """
+    try:
+        return os.environ.get("USER") or getpass.getuser()
+    except (KeyError, OSError):
+        return "unknown"
+
+
+def prompt_selection(prompt: str, options: Sequence[str], allow_new: bool = False, show_descriptions: bool = False) -> Tuple[str, bool]:
     """
     Prompt user with numbered options and return their selection.
     
     Args:
         prompt: The prompt to show
-        options: List of options to choose from
+        options: Options to choose from
         allow_new: Whether to allow entering a new option
         show_descriptions: Whether to show provider descriptions (if available)
         
     Returns:
         Tuple of (selected option, whether it's a new option)
     """
+    # Look up the provider registry once rather than twice per option
+    providers = get_providers() if show_descriptions else {}
+    
     print(f"\n{prompt}")
     for i, option in enumerate(options, 1):
-        if show_descriptions and option.lower() in get_providers():
-            provider = get_providers()[option.lower()]
+        provider = providers.get(option.lower()) if providers else None
+        if provider is not None:
             print(f"[{i}] {option}: {provider.description}")
         else:
             print(f"[{i}] {option}")
@@ -81,8 +81,8 @@ def validate_api_key(api_key: str, provider: str = None) -> str:
         raise ValidationError("API key cannot contain newlines or tabs", field="api_key")
     
     # Provider-specific validation
-    if provider and provider.lower() in API_KEY_PATTERNS:
-        pattern = API_KEY_PATTERNS[provider.lower()]
+    pattern = API_KEY_PATTERNS.get(provider.lower()) if provider else None
+    if pattern is not None:
         if not pattern.match(api_key):
             raise ValidationError(
                 f"API key format is invalid for {provider}",
@@ -4,8 +4,32 @@ Shared pytest fixtures and configuration.
 import os
 import tempfile
 import pytest
+import keymaster.audit
+import keymaster.providers
 from keymaster.db import KeyDatabase
 from keymaster.audit import AuditLogger
+from keymaster.security import KeyStore
+
+@pytest.fixture(autouse=True)
+def reset_audit_logger():
+    """Drop the shared AuditLogger so each test creates its own."""
+    keymaster.audit._audit_logger = None
+    yield
+    keymaster.audit._audit_logger = None
+
+@pytest.fixture(autouse=True)
+def reset_backend_verification():
+    """Make each test select and check the keyring backend again."""
+    KeyStore._backend_verified = False
+    yield
+    KeyStore._backend_verified = False
+
+@pytest.fixture(autouse=True)
+def reset_validation_cache():
+    """Forget key validations cached by earlier tests."""
+    keymaster.providers.clear_validation_cache()
+    yield
+    keymaster.providers.clear_validation_cache()
 
 @pytest.fixture
 def temp_home_dir():
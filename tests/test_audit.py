@@ -0,0 +1,386 @@
+"""Tests for audit event logging and retrieval."""
+
+import base64
+import json
+import os
+import threading
+from datetime import datetime, timezone
+import pytest
+from unittest.mock import patch
+from cryptography.fernet import Fernet
+
+import keymaster.audit as audit_module
+from keymaster.audit import AuditLogger, get_audit_logger
+
+
+@pytest.fixture
+def audit_logger(temp_home_dir):
+    """Create an audit logger backed by a mocked secure storage key."""
+    with patch('keymaster.security.KeyStore') as mock_keystore:
+        mock_keystore.get_system_key.return_value = Fernet.generate_key().decode()
+        yield AuditLogger()
+
+
+def _read_lines(audit_logger):
+    with open(audit_logger._get_log_path()) as f:
+        return [line for line in f.read().splitlines() if line]
+
+
+class TestBatchedLogging:
+    """Test buffered audit event writes."""
+
+    def test_batched_events_buffered_until_flush(self, audit_logger):
+        """Test that batched events are not written until flushed."""
+        with patch.object(audit_module, "AUDIT_BATCH_INTERVAL", 60):
+            audit_logger.log_event_batched("add_key", "testuser", service="openai")
+            audit_logger.log_event_batched("remove_key", "testuser", service="openai")
+
+            assert _read_lines(audit_logger) == []
+
+            audit_logger.flush()
+
+        lines = _read_lines(audit_logger)
+        assert len(lines) == 2
+        assert '"event_type":"add_key"' in lines[0]
+        assert '"event_type":"remove_key"' in lines[1]
+
+    def test_batch_size_triggers_flush(self, audit_logger):
+        """Test that reaching the batch size writes all pending events at once."""
+        with patch.object(audit_module, "AUDIT_BATCH_INTERVAL", 60), \
+             patch.object(audit_module, "AUDIT_BATCH_SIZE", 3):
+            for i in range(3):
+                audit_logger.log_event_batched("test_key", "testuser", environment=f"env{i}")
+
+            assert len(_read_lines(audit_logger)) == 3
+            assert not audit_logger._pending
+            audit_logger.flush()
+
+    def test_clear_events_discards_pending(self, audit_logger):
+        """Test that events buffered before a clear are not written back afterwards."""
+        with patch.object(audit_module, "AUDIT_BATCH_INTERVAL", 60):
+            audit_logger.log_event_batched("add_key", "testuser", service="openai")
+            audit_logger.clear_events(confirm=True)
+
+            assert audit_logger._flush_timer is None
+            assert audit_logger.get_events() == []
+
+        audit_logger.flush()
+        assert _read_lines(audit_logger) == []
+
+    def test_get_events_includes_pending(self, audit_logger):
+        """Test that reading events flushes the buffer first."""
+        with patch.object(audit_module, "AUDIT_BATCH_INTERVAL", 60):
+            audit_logger.log_event_batched("add_key", "testuser", sensitive_data="secret")
+
+            events = audit_logger.get_events(decrypt=True)
+
+        assert len(events) == 1
+        assert events[0]["decrypted_data"] == "secret"
+
+    def test_flush_failure_keeps_events(self, audit_logger):
+        """Test that a failed flush leaves events buffered and raises AuditError."""
+        with patch.object(audit_module, "AUDIT_BATCH_INTERVAL", 60):
+            audit_logger.log_event_batched("add_key", "testuser")
+
+            with patch.object(audit_logger, "_write_lines", side_effect=OSError("disk full")):
+                with pytest.raises(audit_module.AuditError):
+                    audit_logger.flush()
+
+            assert len(audit_logger._pending) == 1
+            audit_logger.flush()
+
+        assert len(_read_lines(audit_logger)) == 1
+
+    def test_log_events_single_write(self, audit_logger):
+        """Test that log_events writes all events with one write."""
+        with patch.object(audit_logger, "_write_lines", wraps=audit_logger._write_lines) as mock_write:
+            audit_logger.log_events([
+                {"event_type": "key_backup", "user": "testuser", "service": "openai"},
+                {"event_type": "add_key", "user": "testuser", "sensitive_data": "secret"},
+            ])
+
+        mock_write.assert_called_once()
+        events = audit_logger.get_events(decrypt=True)
+        assert [e["event_type"] for e in events] == ["key_backup", "add_key"]
+        assert events[1]["decrypted_data"] == "secret"
+
+    def test_flush_syncs_once_per_batch(self, audit_logger):
+        """Test that a flushed batch is synced to disk with a single call."""
+        with patch.object(audit_module, "AUDIT_BATCH_INTERVAL", 60), \
+             patch.object(audit_module, "_sync_file") as mock_sync:
+            for i in range(5):
+                audit_logger.log_event_batched("test_key", "testuser", environment=f"env{i}")
+            mock_sync.assert_not_called()
+
+            audit_logger.flush()
+
+        mock_sync.assert_called_once()
+        assert len(_read_lines(audit_logger)) == 5
+
+    def test_log_path_resolved_once(self, audit_logger):
+        """Test that writing events does not recreate the log directory."""
+        with patch.object(audit_module.os, "makedirs") as mock_makedirs:
+            audit_logger.log_event("init", "testuser")
+            audit_logger.log_event("add_key", "testuser")
+
+        mock_makedirs.assert_not_called()
+        assert len(_read_lines(audit_logger)) == 2
+
+    def test_log_event_writes_immediately(self, audit_logger):
+        """Test that unbatched events are written synchronously without a disk sync."""
+        with patch.object(audit_module, "_sync_file") as mock_sync:
+            audit_logger.log_event("init", "testuser")
+
+        mock_sync.assert_not_called()
+        assert len(_read_lines(audit_logger)) == 1
+        assert os.stat(audit_logger._get_log_path()).st_mode & 0o777 == 0o600
+
+
+class TestEventSerialization:
+    """Test the on-disk audit event format."""
+
+    def test_events_round_trip(self, audit_logger):
+        """Test that events written as UTF-8 JSON lines are read back intact."""
+        audit_logger.log_event(
+            "add_key", "testuser", service="openai", environment="dev",
+            additional_data={"note": "clé"}
+        )
+
+        with open(audit_logger._get_log_path(), "rb") as f:
+            raw = f.read()
+        assert raw.endswith(b"\n")
+        assert json.loads(raw)["metadata"] == {"note": "clé"}
+
+        events = audit_logger.get_events(service="openai")
+        assert len(events) == 1
+        assert events[0]["metadata"] == {"note": "clé"}
+
+    def test_event_timestamps(self, audit_logger):
+        """Test that event timestamps are UTC ISO strings with microseconds."""
+        before = datetime.now(timezone.utc)
+        audit_logger.log_event("init", "testuser")
+        audit_logger.log_event("add_key", "testuser")
+        after = datetime.now(timezone.utc)
+
+        timestamps = [json.loads(line)["timestamp"] for line in _read_lines(audit_logger)]
+        for timestamp in timestamps:
+            assert timestamp.endswith("+00:00")
+            assert len(timestamp) == len("2024-01-01T00:00:00.000000+00:00")
+            assert before.replace(microsecond=0) <= datetime.fromisoformat(timestamp) <= after
+        assert timestamps[0] <= timestamps[1]
+
+    def test_invalid_lines_skipped(self, audit_logger):
+        """Test that corrupt lines are skipped rather than failing the read."""
+        audit_logger.log_event("init", "testuser")
+        with open(audit_logger._get_log_path(), "ab") as f:
+            f.write(b"{not json\n")
+        audit_logger.log_event("add_key", "testuser")
+
+        events = audit_logger.get_events()
+        assert [e["event_type"] for e in events] == ["init", "add_key"]
+
+    def test_iter_events_filters(self, audit_logger):
+        """Test that streamed events are filtered by field and date."""
+        audit_logger.log_event("add_key", "testuser", service="openai", environment="dev")
+        audit_logger.log_event("add_key", "testuser", service="anthropic", environment="dev")
+        audit_logger.log_event("remove_key", "testuser", service="openai", environment="prod",
+                               additional_data={"note": "dev"})
+
+        events = audit_logger.iter_events(service="openai")
+        assert not isinstance(events, list)
+        assert [e["event_type"] for e in events] == ["add_key", "remove_key"]
+
+        events = list(audit_logger.iter_events(environment="dev"))
+        assert [e["service"] for e in events] == ["openai", "anthropic"]
+
+        assert list(audit_logger.iter_events(start_date=datetime(2000, 1, 1, tzinfo=timezone.utc),
+                                             event_type="remove_key"))[0]["environment"] == "prod"
+        assert list(audit_logger.iter_events(end_date=datetime(2000, 1, 1, tzinfo=timezone.utc))) == []
+
+    def test_iter_events_matches_spaced_legacy_lines(self, audit_logger):
+        """Test that lines written with the standard json separators still match filters."""
+        with open(audit_logger._get_log_path(), "a") as f:
+            f.write(json.dumps({"timestamp": "2024-01-01T00:00:00+00:00", "event_type": "init",
+                                "user": "testuser", "service": "openai"}) + "\n")
+
+        assert len(list(audit_logger.iter_events(service="openai", event_type="init"))) == 1
+
+    def test_date_filters_compare_in_utc(self, audit_logger):
+        """Test date filtering with naive local bounds and mixed timestamp formats."""
+        with open(audit_logger._get_log_path(), "a") as f:
+            for timestamp, user in [
+                ("2024-01-01T12:00:00+00:00", "noon"),
+                ("2024-01-01T12:00:00.500000+00:00", "half"),
+                ("2024-01-01T14:00:00+02:00", "legacy-offset"),
+                ("2024-01-02T00:00:00+00:00", "next-day"),
+            ]:
+                f.write(json.dumps({"timestamp": timestamp, "event_type": "init", "user": user}) + "\n")
+
+        start = datetime(2024, 1, 1, 12, 0, 0, 1, tzinfo=timezone.utc)
+        end = datetime(2024, 1, 1, 23, 0, tzinfo=timezone.utc)
+        users = [e["user"] for e in audit_logger.iter_events(start_date=start, end_date=end)]
+        assert users == ["half"]
+
+        # Naive bounds from the command line are local time and must not raise
+        naive_start = datetime(2024, 1, 1, 12).replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+        users = [e["user"] for e in audit_logger.iter_events(start_date=naive_start)]
+        assert users == ["noon", "half", "legacy-offset", "next-day"]
+
+    def test_start_date_seeks_past_earlier_days(self, audit_logger):
+        """Test that the day index built from an existing log lets reads skip earlier days."""
+        with open(audit_logger._get_log_path(), "a") as f:
+            f.write(json.dumps({"timestamp": "2024-01-01T12:00:00+00:00", "event_type": "init",
+                                "user": "old"}) + "\n")
+        audit_logger.log_event("add_key", "testuser")
+
+        log_path = audit_logger._get_log_path()
+        entries = audit_logger._read_index(log_path)
+        assert entries[0] == ("2024-01-01", 0)
+        assert os.stat(log_path + audit_module.AUDIT_INDEX_SUFFIX).st_mode & 0o777 == 0o600
+
+        today = datetime.now(timezone.utc).date().isoformat()
+        offset = audit_logger._start_offset(log_path, today)
+        assert offset == entries[-1][1] > 0
+        assert audit_logger._start_offset(log_path, "2999-01-01") == os.path.getsize(log_path)
+
+        start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+        assert [e["user"] for e in audit_logger.iter_events(start_date=start)] == ["testuser"]
+
+    def test_stale_index_ignored(self, audit_logger):
+        """Test that an index pointing past the end of the log falls back to a full scan."""
+        audit_logger.log_event("init", "testuser")
+        log_path = audit_logger._get_log_path()
+        audit_logger._append_index(log_path, [("2999-01-01", 10 ** 6)])
+
+        assert audit_logger._start_offset(log_path, "2999-01-01") == 0
+        start = datetime(2000, 1, 1, tzinfo=timezone.utc)
+        assert len(list(audit_logger.iter_events(start_date=start))) == 1
+
+    def test_clear_events_removes_index(self, audit_logger):
+        """Test that clearing the log also clears its day index."""
+        audit_logger.log_event("init", "testuser")
+        log_path = audit_logger._get_log_path()
+        assert os.path.exists(log_path + audit_module.AUDIT_INDEX_SUFFIX)
+
+        audit_logger.clear_events(confirm=True)
+        assert not os.path.exists(log_path + audit_module.AUDIT_INDEX_SUFFIX)
+
+    def test_clear_events_blocks_concurrent_writes(self, audit_logger):
+        """Test that a write racing a clear waits until the index has been removed."""
+        audit_logger.log_event("init", "testuser")
+        log_path = audit_logger._get_log_path()
+        writer = threading.Thread(target=audit_logger.log_event, args=("add_key", "testuser"))
+        real_remove = os.remove
+
+        def remove_while_writing(path):
+            # Start a write between the truncation and the index removal
+            writer.start()
+            writer.join(timeout=0.2)
+            assert writer.is_alive()
+            real_remove(path)
+
+        with patch.object(audit_module.os, "remove", side_effect=remove_while_writing):
+            audit_logger.clear_events(confirm=True)
+        writer.join()
+
+        assert len(_read_lines(audit_logger)) == 1
+        # The write after the clear started a fresh index at offset 0
+        assert audit_logger._read_index(log_path)[0][1] == 0
+
+        audit_logger.log_event("add_key", "testuser")
+        assert audit_logger._read_index(log_path)[0][1] == 0
+
+    def test_get_recent_events(self, audit_logger):
+        """Test that only the newest events are returned and decrypted, oldest first."""
+        for i in range(5):
+            audit_logger.log_event("add_key", "testuser", environment=f"env{i}",
+                                   sensitive_data=f"secret{i}")
+        with open(audit_logger._get_log_path(), "ab") as f:
+            f.write(b"{not json\n\n")
+
+        with patch.object(audit_module, "AUDIT_REVERSE_READ_SIZE", 7), \
+             patch.object(audit_logger, "_decrypt_sensitive_data",
+                          wraps=audit_logger._decrypt_sensitive_data) as mock_decrypt:
+            events = audit_logger.get_recent_events(2, decrypt=True)
+
+        assert [e["environment"] for e in events] == ["env3", "env4"]
+        assert [e["decrypted_data"] for e in events] == ["secret3", "secret4"]
+        assert mock_decrypt.call_count == 2
+
+        assert len(audit_logger.get_recent_events(10)) == 5
+        assert audit_logger.get_recent_events(0) == []
+
+    def test_export_events(self, audit_logger, tmp_path):
+        """Test exporting events to a JSON file."""
+        audit_logger.log_event("init", "testuser")
+        output = tmp_path / "export.json"
+
+        audit_logger.export_events(str(output))
+
+        exported = json.loads(output.read_text())
+        assert [e["event_type"] for e in exported] == ["init"]
+
+    def test_export_events_streams(self, audit_logger, tmp_path):
+        """Test that export streams events into a valid, owner-only JSON file."""
+        audit_logger.log_event("init", "testuser")
+        audit_logger.log_event("add_key", "testuser", sensitive_data="secret")
+        output = tmp_path / "export.json"
+        output.write_text("stale contents that are longer than the export itself" * 10)
+        os.chmod(output, 0o644)
+
+        with patch.object(audit_logger, "get_events") as mock_get_events:
+            audit_logger.export_events(str(output), decrypt=True)
+
+        mock_get_events.assert_not_called()
+        exported = json.loads(output.read_text())
+        assert [e["event_type"] for e in exported] == ["init", "add_key"]
+        assert exported[1]["decrypted_data"] == "secret"
+        assert os.stat(output).st_mode & 0o777 == 0o600
+
+    def test_export_no_events(self, audit_logger, tmp_path):
+        """Test that exporting an empty log writes an empty JSON array."""
+        output = tmp_path / "export.json"
+        audit_logger.export_events(str(output))
+        assert json.loads(output.read_text()) == []
+
+
+class TestSensitiveDataEncryption:
+    """Test encryption of sensitive audit data."""
+
+    def test_aesgcm_round_trip(self, audit_logger):
+        """Test that new entries use versioned AES-GCM payloads with a fresh nonce."""
+        first = audit_logger._encrypt_sensitive_data("secret")
+        second = audit_logger._encrypt_sensitive_data("secret")
+
+        assert first != second
+        assert base64.urlsafe_b64decode(first)[:1] == audit_module.AESGCM_PAYLOAD_VERSION
+        assert audit_logger._decrypt_sensitive_data(first) == "secret"
+
+    def test_decrypts_legacy_fernet_entries(self, audit_logger):
+        """Test that entries written with Fernet still decrypt."""
+        token = audit_logger.fernet.encrypt(b"legacy secret").decode()
+        assert audit_logger._decrypt_sensitive_data(token) == "legacy secret"
+
+    def test_tampered_payload_rejected(self, audit_logger):
+        """Test that a modified AES-GCM payload fails authentication."""
+        raw = bytearray(base64.urlsafe_b64decode(audit_logger._encrypt_sensitive_data("secret")))
+        raw[-1] ^= 1
+
+        with pytest.raises(audit_module.AuditError):
+            audit_logger._decrypt_sensitive_data(base64.urlsafe_b64encode(bytes(raw)).decode())
+
+
+class TestSharedAuditLogger:
+    """Test the process-wide AuditLogger accessor."""
+
+    def test_get_audit_logger_reuses_instance(self, temp_home_dir):
+        """Test that the encryption key is looked up only once per process."""
+        with patch('keymaster.security.KeyStore') as mock_keystore:
+            mock_keystore.get_system_key.return_value = Fernet.generate_key().decode()
+
+            first = get_audit_logger()
+            second = get_audit_logger()
+
+        assert first is second
+        assert isinstance(first, AuditLogger)
+        mock_keystore.get_system_key.assert_called_once_with("audit_encryption")
@@ -4,12 +4,24 @@ import pytest
 import tempfile
 import os
 import json
+import mmap
 from unittest.mock import patch, MagicMock
 
-from keymaster.backup import BackupManager
+from cryptography.fernet import Fernet
+from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+
+from keymaster.backup import (
+    BackupManager, clear_derived_key_cache,
+    BACKUP_FILE_HEADER, BACKUP_SALT_SIZE, LEGACY_BACKUP_SALT
+)
 from keymaster.exceptions import BackupError
 
 
+def _stored_keys(pairs):
+    """Stand-in for KeyStore.get_keys returning a predictable key for each pair."""
+    return {(service, env): f"key_for_{service}_{env}" for service, env in pairs}
+
+
 class TestBackupManager:
     """Test the BackupManager class."""
     
@@ -18,6 +30,7 @@ class TestBackupManager:
         self.backup_manager = BackupManager()
         self.test_password = "test_password_123"
     
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
     @patch('keymaster.backup.KeyStore.list_keys')
     @patch('keymaster.backup.KeyStore.get_key')
     def test_create_backup_success(self, mock_get_key, mock_list_keys):
@@ -50,6 +63,9 @@ class TestBackupManager:
             assert 'prod' in summary['environments']
             assert summary['file_size'] > 0
             
+            # Keys are fetched in bulk rather than one at a time
+            mock_get_key.assert_not_called()
+            
             # Verify file exists and has content
             assert os.path.exists(backup_path)
             assert os.path.getsize(backup_path) > 0
@@ -58,15 +74,14 @@ class TestBackupManager:
             if os.path.exists(backup_path):
                 os.unlink(backup_path)
     
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
     @patch('keymaster.backup.KeyStore.list_keys')
     @patch('keymaster.backup.KeyStore.get_key')
     def test_create_backup_with_filters(self, mock_get_key, mock_list_keys):
         """Test backup creation with service/environment filters."""
-        # Mock stored keys
+        # Mock stored keys matching the filters
         mock_list_keys.return_value = [
-            ('openai', 'dev', '2023-01-01T00:00:00', 'user1'),
-            ('openai', 'prod', '2023-01-01T00:00:00', 'user1'),
-            ('anthropic', 'dev', '2023-01-01T00:00:00', 'user1')
+            ('openai', 'dev', '2023-01-01T00:00:00', 'user1')
         ]
         
         mock_get_key.side_effect = lambda service, env: f"key_for_{service}_{env}"
@@ -83,8 +98,8 @@ class TestBackupManager:
                 environment_filter="dev"
             )
             
-            # Should only have the filtered keys
-            # Note: list_keys with service filter returns all, then we filter in collect_backup_data
+            # Filtering is done by the key store
+            mock_list_keys.assert_called_once_with("openai", "dev")
             assert summary['keys_count'] == 1
             assert 'openai' in summary['services']
             assert 'dev' in summary['environments']
@@ -103,6 +118,7 @@ class TestBackupManager:
                 password=self.test_password
             )
     
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
     @patch('keymaster.backup.KeyStore.list_keys')
     @patch('keymaster.backup.KeyStore.get_key')
     @patch('keymaster.backup.KeyStore.store_key')
@@ -148,6 +164,7 @@ class TestBackupManager:
             if os.path.exists(backup_path):
                 os.unlink(backup_path)
     
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
     @patch('keymaster.backup.KeyStore.list_keys')
     @patch('keymaster.backup.KeyStore.get_key')
     def test_restore_backup_dry_run(self, mock_get_key, mock_list_keys):
@@ -200,11 +217,46 @@ class TestBackupManager:
                 )
             
             assert "decrypt" in str(exc_info.value)
-            
+        
         finally:
             if os.path.exists(backup_path):
                 os.unlink(backup_path)
     
+    @patch('keymaster.backup.KeyStore.list_keys')
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
+    def test_restore_wrong_password_closes_mapping(self, mock_list_keys):
+        """Test that the mapped backup file is closed when decryption fails."""
+        mock_list_keys.return_value = [('openai', 'dev', '2023-01-01T00:00:00', 'user1')]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "backup.kmbackup")
+            self.backup_manager.create_backup(path, self.test_password, include_audit_logs=False)
+            
+            real_mmap = mmap.mmap
+            mappings = []
+    
+            def tracking_mmap(*args, **kwargs):
+                mappings.append(real_mmap(*args, **kwargs))
+                return mappings[-1]
+            
+            with patch('keymaster.backup.mmap.mmap', side_effect=tracking_mmap):
+                with pytest.raises(BackupError):
+                    self.backup_manager.restore_backup(path, "wrong_password")
+            
+            assert len(mappings) == 1
+            assert mappings[0].closed
+    
+    def test_restore_empty_backup_file(self):
+        """Test that an empty backup file is reported as corrupted."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "empty.kmbackup")
+            open(path, 'wb').close()
+            
+            with pytest.raises(BackupError) as exc_info:
+                self.backup_manager.restore_backup(path, self.test_password)
+            
+            assert "decrypt" in str(exc_info.value)
+    
     def test_restore_backup_missing_file(self):
         """Test restore with missing backup file."""
         with pytest.raises(BackupError) as exc_info:
@@ -215,6 +267,7 @@ class TestBackupManager:
         
         assert "not found" in str(exc_info.value)
     
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
     @patch('keymaster.backup.KeyStore.list_keys')
     @patch('keymaster.backup.KeyStore.get_key')
     def test_verify_backup(self, mock_get_key, mock_list_keys):
@@ -236,8 +289,12 @@ class TestBackupManager:
             )
             
             # Test verification with correct password
+            mock_list_keys.reset_mock()
             assert self.backup_manager.verify_backup(backup_path, self.test_password) is True
             
+            # Verification does not need to look at the key store
+            mock_list_keys.assert_not_called()
+            
             # Test verification with wrong password
             assert self.backup_manager.verify_backup(backup_path, "wrong_password") is False
             
@@ -260,6 +317,110 @@ class TestBackupManager:
         # Key should be proper length for Fernet
         assert len(key1) == 44  # Base64 encoded 32-byte key
     
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
+    @patch('keymaster.backup.KeyStore.list_keys')
+    def test_backup_written_atomically(self, mock_list_keys):
+        """Test that backups replace the target in one step and leave no temp files."""
+        mock_list_keys.return_value = [('openai', 'dev', '2023-01-01T00:00:00', 'user1')]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "backup.kmbackup")
+            with open(path, 'wb') as f:
+                f.write(b"previous backup")
+            
+            # A failed write leaves the previous backup in place
+            with patch('keymaster.backup.os.fsync', side_effect=OSError("disk full")):
+                with pytest.raises(BackupError):
+                    self.backup_manager.create_backup(path, self.test_password, include_audit_logs=False)
+            with open(path, 'rb') as f:
+                assert f.read() == b"previous backup"
+            assert os.listdir(temp_dir) == ["backup.kmbackup"]
+            
+            self.backup_manager.create_backup(path, self.test_password, include_audit_logs=False)
+            assert os.listdir(temp_dir) == ["backup.kmbackup"]
+            assert os.stat(path).st_mode & 0o777 == 0o600
+            assert self.backup_manager.verify_backup(path, self.test_password) is True
+    
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
+    @patch('keymaster.backup.KeyStore.list_keys')
+    @patch('keymaster.backup.KeyStore.get_key')
+    def test_backup_uses_random_salt(self, mock_get_key, mock_list_keys):
+        """Test that each backup is encrypted with its own salt stored in a header."""
+        mock_list_keys.return_value = [('openai', 'dev', '2023-01-01T00:00:00', 'user1')]
+        mock_get_key.side_effect = lambda service, env: f"key_for_{service}_{env}"
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            paths = [os.path.join(temp_dir, f"backup{i}.kmbackup") for i in range(2)]
+            for path in paths:
+                self.backup_manager.create_backup(path, self.test_password, include_audit_logs=False)
+            
+            salts = []
+            for path in paths:
+                with self.backup_manager._open_backup_file(path) as (_, salt, _):
+                    salts.append(salt)
+            for path in paths:
+                with open(path, 'rb') as f:
+                    assert f.read().startswith(BACKUP_FILE_HEADER)
+            
+            assert len(salts[0]) == BACKUP_SALT_SIZE
+            assert salts[0] != salts[1]
+            assert self.backup_manager.list_backup_contents(paths[0], self.test_password)['total_keys'] == 1
+            assert self.backup_manager.verify_backup(paths[0], "wrong_password") is False
+    
+    def test_restore_legacy_backup_without_header(self):
+        """Test that backups written with the fixed salt can still be read."""
+        fernet = Fernet(self.backup_manager._derive_key_from_password(self.test_password, LEGACY_BACKUP_SALT))
+        backup_data = {
+            "version": BackupManager.BACKUP_VERSION,
+            "magic": BackupManager.BACKUP_MAGIC,
+            "created_at": "2023-01-01T00:00:00",
+            "keys": [],
+            "audit_logs": []
+        }
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "legacy.kmbackup")
+            with open(path, 'wb') as f:
+                f.write(fernet.encrypt(json.dumps(backup_data).encode()))
+            
+            with self.backup_manager._open_backup_file(path) as (header, salt, _):
+                assert (header, salt) == (None, LEGACY_BACKUP_SALT)
+            assert self.backup_manager.verify_backup(path, self.test_password) is True
+    
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
+    @patch('keymaster.backup.KeyStore.list_keys')
+    def test_tampered_header_rejected(self, mock_list_keys):
+        """Test that the salt and header are authenticated along with the payload."""
+        mock_list_keys.return_value = [('openai', 'dev', '2023-01-01T00:00:00', 'user1')]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "backup.kmbackup")
+            self.backup_manager.create_backup(path, self.test_password, include_audit_logs=False)
+            assert self.backup_manager.verify_backup(path, self.test_password) is True
+            
+            with open(path, 'rb') as f:
+                contents = bytearray(f.read())
+            contents[-1] ^= 1
+            with open(path, 'wb') as f:
+                f.write(bytes(contents))
+            
+            assert self.backup_manager.verify_backup(path, self.test_password) is False
+    
+    def test_derive_key_cached(self):
+        """Test that repeated derivations with the same password skip the KDF."""
+        clear_derived_key_cache()
+        with patch('keymaster.backup.PBKDF2HMAC', wraps=PBKDF2HMAC) as mock_kdf:
+            key1 = self.backup_manager._derive_key_from_password("password123")
+            key2 = self.backup_manager._derive_key_from_password("password123")
+            self.backup_manager._derive_key_from_password("different")
+        
+        assert key1 == key2
+        assert mock_kdf.call_count == 2
+        
+        clear_derived_key_cache()
+        assert self.backup_manager._derive_key_from_password("password123") == key1
+    
+    @patch('keymaster.backup.KeyStore.get_keys', new=_stored_keys)
     @patch('keymaster.backup.KeyStore.list_keys')
     @patch('keymaster.backup.KeyStore.get_key')
     @patch('keymaster.backup.KeyStore.store_key')
@@ -304,6 +465,9 @@ class TestBackupManager:
             assert summary['restored_keys'] == 1
             assert summary['skipped_keys'] == 0
             
+            # Existing keys come from the key listing, not per-key lookups
+            mock_get_key.assert_not_called()
+            
         finally:
             if os.path.exists(backup_path):
                 os.unlink(backup_path)
\ No newline at end of file
@@ -0,0 +1,128 @@
+"""Tests for configuration loading and caching."""
+
+import os
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+from keymaster.config import ConfigManager
+from keymaster.exceptions import ConfigurationError
+
+
+@pytest.fixture(autouse=True)
+def clear_config_cache():
+    """Reset the parsed config cache around each test."""
+    ConfigManager._cache = None
+    ConfigManager._created_dirs.clear()
+    ConfigManager._cipher = None
+    yield
+    ConfigManager._cache = None
+    ConfigManager._created_dirs.clear()
+    ConfigManager._cipher = None
+
+
+class TestConfigCache:
+    """Test mtime-based caching of the parsed config file."""
+
+    def test_missing_config(self, temp_home_dir):
+        """Test that a missing config file loads as an empty dict."""
+        assert ConfigManager.load_config() == {}
+
+    def test_unchanged_file_parsed_once(self, temp_home_dir):
+        """Test that repeated loads of an unchanged file do not re-parse it."""
+        ConfigManager.write_config({"log_level": "INFO"})
+
+        with patch('keymaster.config.yaml.load', wraps=yaml.load) as mock_load:
+            assert ConfigManager.load_config() == {"log_level": "INFO"}
+            assert ConfigManager.load_config() == {"log_level": "INFO"}
+
+        mock_load.assert_not_called()
+
+    def test_external_change_invalidates_cache(self, temp_home_dir):
+        """Test that a modified file is re-read."""
+        ConfigManager.write_config({"log_level": "INFO"})
+        assert ConfigManager.load_config() == {"log_level": "INFO"}
+
+        path = ConfigManager._get_config_path()
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"log_level": "DEBUG"}, f)
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        assert ConfigManager.load_config() == {"log_level": "DEBUG"}
+
+    def test_size_change_with_same_mtime_invalidates_cache(self, temp_home_dir):
+        """Test that a rewrite within the same mtime tick is still detected."""
+        ConfigManager.write_config({"log_level": "INFO"})
+        assert ConfigManager.load_config() == {"log_level": "INFO"}
+
+        path = ConfigManager._get_config_path()
+        stat = os.stat(path)
+        with open(path, "w", encoding="utf-8") as f:
+            yaml.safe_dump({"log_level": "WARNING"}, f)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert ConfigManager.load_config() == {"log_level": "WARNING"}
+
+    def test_config_dir_created_once(self, temp_home_dir):
+        """Test that the config directory is only created on first use."""
+        with patch('keymaster.config.os.makedirs') as mock_makedirs:
+            ConfigManager._get_config_path()
+            ConfigManager._get_config_path()
+
+        mock_makedirs.assert_called_once()
+
+    def test_loaded_config_is_a_copy(self, temp_home_dir):
+        """Test that modifying a loaded config does not leak into later loads."""
+        ConfigManager.write_config({"audit": {"encryption_key": "abc"}})
+
+        config = ConfigManager.load_config()
+        config["audit"]["encryption_key"] = "changed"
+
+        assert ConfigManager.load_config() == {"audit": {"encryption_key": "abc"}}
+
+
+class TestDataEncryption:
+    """Test AES-GCM encryption of config values."""
+
+    @pytest.fixture
+    def system_keys(self):
+        """Keep system keys in memory instead of the keyring."""
+        keys = {}
+        with patch('keymaster.security.KeyStore') as mock_keystore:
+            mock_keystore.get_system_key.side_effect = keys.get
+            mock_keystore.store_system_key.side_effect = keys.__setitem__
+            yield mock_keystore
+
+    def test_round_trip(self, system_keys):
+        """Test that encrypted data decrypts to the original and is not plaintext."""
+        encrypted = ConfigManager.encrypt_data("sk-secret-é")
+
+        assert "sk-secret" not in encrypted
+        assert encrypted != ConfigManager.encrypt_data("sk-secret-é")  # Fresh nonce each time
+        assert ConfigManager.decrypt_data(encrypted) == "sk-secret-é"
+
+    def test_key_created_once(self, system_keys):
+        """Test that the key is generated, stored, and then reused."""
+        ConfigManager.encrypt_data("a")
+        ConfigManager.encrypt_data("b")
+
+        system_keys.store_system_key.assert_called_once()
+        system_keys.get_system_key.assert_called_once_with("config_encryption")
+
+    def test_existing_key_used_after_restart(self, system_keys):
+        """Test that data encrypted earlier decrypts with the stored key."""
+        encrypted = ConfigManager.encrypt_data("value")
+        ConfigManager._cipher = None
+
+        assert ConfigManager.decrypt_data(encrypted) == "value"
+        system_keys.store_system_key.assert_called_once()
+
+    def test_tampered_data_rejected(self, system_keys):
+        """Test that modified ciphertext fails authentication."""
+        encrypted = bytearray(ConfigManager.encrypt_data("value").encode())
+        encrypted[-2] = ord("A") if encrypted[-2] != ord("A") else ord("B")
+
+        with pytest.raises(ConfigurationError):
+            ConfigManager.decrypt_data(encrypted.decode())
@@ -1,6 +1,8 @@
 from datetime import datetime
+import sqlite3
 import pytest
-from keymaster.db import KeyDatabase
+from unittest.mock import patch
+from keymaster.db import KeyDatabase, METADATA_QUERY_BATCH_SIZE
 
 class TestKeyDatabase:
     def test_add_key(self, test_db):
@@ -30,4 +32,62 @@ class TestKeyDatabase:
         
         # Verify it's gone
         metadata = test_db.get_key_metadata("OpenAI", "test")
-        assert metadata is None 
\ No newline at end of file
+        assert metadata is None
+        
+    def test_list_keys_filters(self, test_db):
+        for service, environment in [("openai", "dev"), ("openai", "prod"), ("anthropic", "dev")]:
+            test_db.add_key(service, environment, f"keymaster-{service}", "testuser")
+        
+        assert len(test_db.list_keys()) == 3
+        assert [row[:2] for row in test_db.list_keys("OpenAI")] == [("openai", "dev"), ("openai", "prod")]
+        assert [row[:2] for row in test_db.list_keys(environment="DEV")] == [("anthropic", "dev"), ("openai", "dev")]
+        assert [row[:2] for row in test_db.list_keys("openai", "dev")] == [("openai", "dev")]
+        
+    def test_get_keys_metadata(self, test_db):
+        for service, environment in [("OpenAI", "dev"), ("OpenAI", "prod"), ("Anthropic", "dev")]:
+            test_db.add_key(
+                service_name=service.lower(),
+                environment=environment,
+                keychain_service_name=f"keymaster-{service.lower()}",
+                user="testuser"
+            )
+        
+        metadata = test_db.get_keys_metadata([("OpenAI", "DEV"), ("anthropic", "dev"), ("Stability", "dev")])
+        
+        assert set(metadata) == {("openai", "dev"), ("anthropic", "dev")}
+        assert metadata[("anthropic", "dev")]["keychain_service_name"] == "keymaster-anthropic"
+        assert test_db.get_keys_metadata([]) == {}
+        
+    def test_get_keys_metadata_many_pairs(self, test_db):
+        for environment in ("env0", "env450", "env899"):
+            test_db.add_key(
+                service_name="openai",
+                environment=environment,
+                keychain_service_name="keymaster-openai",
+                user="testuser"
+            )
+        pairs = [("OpenAI", f"env{i}") for i in range(900)]
+        real_connect = sqlite3.connect
+        
+        def connect_with_old_limit(*args, **kwargs):
+            # Match SQLite builds older than 3.32, which allow 999 bound variables
+            conn = real_connect(*args, **kwargs)
+            conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+            return conn
+        
+        with patch('keymaster.db.sqlite3.connect', side_effect=connect_with_old_limit) as mock_connect:
+            metadata = test_db.get_keys_metadata(pairs)
+        
+        assert len(pairs) > METADATA_QUERY_BATCH_SIZE
+        assert set(metadata) == {("openai", "env0"), ("openai", "env450"), ("openai", "env899")}
+        assert mock_connect.call_count == 1
+        
+    def test_schema_prepared_once_per_process(self, test_db):
+        with patch.object(KeyDatabase, '_init_db') as mock_init, \
+             patch.object(KeyDatabase, 'normalize_service_names') as mock_normalize:
+            KeyDatabase()
+            KeyDatabase()
+        
+        mock_init.assert_not_called()
+        mock_normalize.assert_not_called()
+        assert test_db.db_path in KeyDatabase._initialized_paths
@@ -94,4 +94,12 @@ class TestEnvManager:
         content = env_file.read_text()
         assert "KEY_WITH_SPACES=value with spaces" in content
         assert 'KEY_WITH_QUOTES=value"with"quotes' in content
-        assert "KEY_WITH_NEWLINES=value\nwith\nnewlines" in content 
\ No newline at end of file
+        assert "KEY_WITH_NEWLINES=value\nwith\nnewlines" in content 
+    def test_load_env_file(self, tmp_path):
+        """Test loading variables from a .env file."""
+        env_file = tmp_path / ".env"
+        env_file.write_text("KEYMASTER_TEST_LOADED=from_file\n")
+        
+        with patch.dict(os.environ, {}, clear=True):
+            EnvManager.load_env_file(str(env_file))
+            assert os.environ["KEYMASTER_TEST_LOADED"] == "from_file"
@@ -130,6 +130,13 @@ class TestFuzzyMatching:
         matches = _get_closest_matches("xyz", candidates)
         assert len(matches) == 0  # No good matches with similarity > 0.3
     
+    def test_get_closest_matches_counts_repeated_characters(self):
+        """Test that repeated target characters each count towards similarity."""
+        # "eeee" shares 4 characters with "deepseek" (4/8 = 0.5) but only
+        # 1 distinct character, which would fall below the 0.3 cutoff
+        assert _get_closest_matches("eeee", ["deepseek"]) == ["deepseek"]
+        assert _get_closest_matches("EEEE", ["DeepSeek", "stability"]) == ["DeepSeek"]
+    
     def test_get_closest_matches_empty(self):
         """Test fuzzy matching with empty inputs."""
         assert _get_closest_matches("", ["test"]) == []
@@ -0,0 +1,118 @@
+"""Tests for the application log file pipeline."""
+
+import logging
+import queue
+from unittest.mock import patch
+
+import pytest
+import structlog
+
+from keymaster import serialization
+from keymaster import _BufferedFileHandler, _BufferedQueueListener, _DroppingQueueHandler
+
+
+def _record(message):
+    return logging.LogRecord("keymaster", logging.INFO, __file__, 0, message, None, None)
+
+
+class TestBufferedLogFile:
+    """Test the buffered application log file writer."""
+
+    def test_file_created_on_first_record(self, tmp_path):
+        """Test that the log directory and file are not created until needed."""
+        path = tmp_path / "logs" / "keymaster.log"
+        handler = _BufferedFileHandler(str(path))
+        assert not path.parent.exists()
+
+        handler.handle(_record("first"))
+        handler.flush()
+        handler.close()
+
+        assert path.read_text() == "first\n"
+
+    def test_records_buffered_until_flush(self, tmp_path):
+        """Test that records are held in the write buffer until flushed."""
+        path = tmp_path / "keymaster.log"
+        handler = _BufferedFileHandler(str(path))
+
+        handler.handle(_record("one"))
+        handler.handle(_record("two"))
+        assert path.read_text() == ""
+
+        handler.flush()
+        assert path.read_text() == "one\ntwo\n"
+        handler.close()
+
+    def test_listener_flushes_when_queue_drained(self, tmp_path):
+        """Test that queued records reach the file once the listener catches up."""
+        path = tmp_path / "keymaster.log"
+        log_queue = queue.Queue()
+        handler = _BufferedFileHandler(str(path))
+        listener = _BufferedQueueListener(log_queue, handler)
+
+        for i in range(3):
+            log_queue.put(_record(f"event {i}"))
+        listener.start()
+        listener.stop()
+
+        assert path.read_text().splitlines() == ["event 0", "event 1", "event 2"]
+        handler.close()
+
+
+class TestQueueHandler:
+    """Test the non-blocking queue handler."""
+
+    @pytest.fixture(autouse=True)
+    def no_atexit(self):
+        """Keep test listeners out of the interpreter's exit handlers."""
+        with patch('keymaster.atexit.register'):
+            yield
+
+    def test_listener_started_on_first_record(self, tmp_path):
+        """Test that no writer thread is started until something is logged."""
+        path = tmp_path / "keymaster.log"
+        file_handler = _BufferedFileHandler(str(path))
+        listener = _BufferedQueueListener(queue.Queue(), file_handler)
+        handler = _DroppingQueueHandler(listener)
+        assert listener._thread is None
+
+        handler.handle(_record("first"))
+        assert listener._thread is not None
+        thread = listener._thread
+
+        handler.handle(_record("second"))
+        listener.stop()
+
+        assert not thread.is_alive()
+        assert path.read_text().splitlines() == ["first", "second"]
+        file_handler.close()
+
+    def test_full_queue_drops_records(self, tmp_path):
+        """Test that records are dropped rather than blocking when the queue is full."""
+        file_handler = _BufferedFileHandler(str(tmp_path / "keymaster.log"))
+        listener = _BufferedQueueListener(queue.Queue(maxsize=1), file_handler)
+        listener.start = lambda: None  # Keep the queue from being drained
+        handler = _DroppingQueueHandler(listener)
+
+        handler.handle(_record("kept"))
+        handler.handle(_record("dropped"))
+
+        assert listener.queue.qsize() == 1
+        assert listener.queue.get_nowait().getMessage() == "kept"
+
+
+class TestStructlogConfiguration:
+    """Test the structlog processor chain."""
+
+    def test_filtered_events_not_rendered(self):
+        """Test that events below the logging level are dropped before rendering."""
+        logger = structlog.get_logger("keymaster.test")
+
+        with patch('keymaster.serialization.dumps', wraps=serialization.dumps) as mock_dumps, \
+             patch.object(logging.getLogger("keymaster.test"), "level", logging.INFO):
+            logger.debug("hidden", secret="value")
+            mock_dumps.assert_not_called()
+
+            logger.info("shown", count=1)
+            mock_dumps.assert_called_once()
+            assert mock_dumps.call_args[0][0]["event"] == "shown"
@@ -9,7 +9,13 @@ from keymaster.providers import (
     get_provider_by_name,
     _providers,
     _load_generic_providers,
-    _save_generic_providers
+    _save_generic_providers,
+    _get_session,
+    PROVIDER_TEST_TIMEOUT,
+    validate_provider_key,
+    validate_keys_bulk,
+    invalidate_validation,
+    invalidate_service_validations
 )
 import os
 import json
@@ -65,6 +71,154 @@ class TestDeepSeekProvider:
         with pytest.raises(requests.exceptions.HTTPError):
             DeepSeekProvider.test_key("invalid-key")
 
+class TestAnthropicProvider:
+    @responses.activate
+    def test_valid_key(self):
+        responses.add(
+            responses.POST,
+            "https://api.anthropic.com/v1/messages",
+            json={"content": [{"type": "text", "text": "test"}]},
+            status=200
+        )
+        
+        result = AnthropicProvider.test_key("test-key")
+        assert "content" in result
+        
+        request = responses.calls[0].request
+        assert request.headers["x-api-key"] == "test-key"
+        assert request.headers["anthropic-version"] == "2023-06-01"
+        assert json.loads(request.body)["model"] == AnthropicProvider._TEST_PAYLOAD["model"]
+        assert "x-api-key" not in AnthropicProvider._BASE_HEADERS
+
+class TestHTTPSession:
+    def test_session_reused(self):
+        """Test that key tests share one HTTP session."""
+        assert _get_session() is _get_session()
+        assert isinstance(_get_session(), requests.Session)
+
+    @responses.activate
+    def test_provider_requests_use_timeout(self):
+        """Test that provider key tests go through the shared session with a timeout."""
+        responses.add(
+            responses.GET,
+            "https://api.stability.ai/v1/engines/list",
+            json=[],
+            status=200
+        )
+        
+        with patch.object(_get_session(), 'get', wraps=_get_session().get) as mock_get:
+            StabilityProvider.test_key("test-key")
+        
+        assert mock_get.call_args.kwargs["timeout"] == PROVIDER_TEST_TIMEOUT
+
+    @responses.activate
+    def test_transient_gateway_error_retried(self):
+        """Test that a 503 from a provider is retried before the key is judged."""
+        responses.add(responses.GET, "https://api.stability.ai/v1/engines/list", status=503)
+        responses.add(responses.GET, "https://api.stability.ai/v1/engines/list", json=[], status=200)
+        
+        with patch('urllib3.util.retry.Retry.sleep'):
+            assert StabilityProvider.test_key("test-key") == []
+        assert len(responses.calls) == 2
+
+    @responses.activate
+    def test_persistent_gateway_error_raises_http_error(self):
+        """Test that exhausted retries still surface as an HTTPError."""
+        responses.add(responses.GET, "https://api.stability.ai/v1/engines/list", status=503)
+        
+        with patch('urllib3.util.retry.Retry.sleep'), \
+             pytest.raises(requests.exceptions.HTTPError):
+            StabilityProvider.test_key("test-key")
+
+class TestValidationCache:
+    def _provider(self):
+        provider = MagicMock()
+        provider.service_name = "TestAPI"
+        provider.test_url = None
+        provider.api_url = "https://api.test.com"
+        provider.test_key.return_value = {"ok": True}
+        return provider
+
+    def test_success_cached(self):
+        """Test that a successful validation is reused for the same key."""
+        provider = self._provider()
+        
+        assert validate_provider_key(provider, "key-1") == {"ok": True}
+        assert validate_provider_key(provider, "key-1") == {"ok": True}
+        validate_provider_key(provider, "key-2")
+        
+        assert provider.test_key.call_count == 2
+
+    def test_failure_not_cached(self):
+        """Test that a failing key is tested again every time."""
+        provider = self._provider()
+        provider.test_key.side_effect = requests.exceptions.HTTPError("401")
+        
+        for _ in range(2):
+            with pytest.raises(requests.exceptions.HTTPError):
+                validate_provider_key(provider, "bad-key")
+        assert provider.test_key.call_count == 2
+
+    def test_expired_entry_retested(self):
+        """Test that validations expire after the TTL."""
+        provider = self._provider()
+        
+        with patch('keymaster.providers.time.monotonic', return_value=1000.0):
+            validate_provider_key(provider, "key-1")
+        with patch('keymaster.providers.time.monotonic', return_value=1000.0 + 301):
+            validate_provider_key(provider, "key-1")
+        
+        assert provider.test_key.call_count == 2
+
+    def test_invalidate(self):
+        """Test that invalidating a key forces a fresh test."""
+        provider = self._provider()
+        
+        validate_provider_key(provider, "key-1")
+        invalidate_validation("key-1")
+        validate_provider_key(provider, "key-1")
+        
+        assert provider.test_key.call_count == 2
+
+    def test_invalidate_service(self):
+        """Test that invalidating a service forces fresh tests of all its keys."""
+        provider = self._provider()
+        
+        validate_provider_key(provider, "key-1")
+        validate_provider_key(provider, "key-2")
+        invalidate_service_validations("testapi")
+        validate_provider_key(provider, "key-1")
+        validate_provider_key(provider, "key-2")
+        
+        assert provider.test_key.call_count == 4
+
+    def test_untested_result_not_cached(self, clear_providers):
+        """Test that a generic provider without a test URL is not cached as valid."""
+        provider = GenericProvider(service_name="TestAPI", description="Test API Service")
+        
+        with patch.object(GenericProvider, 'test_key', wraps=provider.test_key) as mock_test:
+            validate_provider_key(provider, "key-1")
+            validate_provider_key(provider, "key-1")
+        
+        assert mock_test.call_count == 2
+
+    def test_bulk_results_in_order(self):
+        """Test that bulk validation returns per-key results in input order."""
+        provider = self._provider()
+        def fake_test_key(key):
+            if key == "bad":
+                raise ValueError("invalid")
+            return {"key": key}
+        provider.test_key.side_effect = fake_test_key
+        
+        results = validate_keys_bulk([(provider, "a"), (provider, "bad"), (provider, "c")])
+        
+        assert results[0] == ({"key": "a"}, None)
+        assert results[1][0] is None and str(results[1][1]) == "invalid"
+        assert results[1][1].__traceback__ is None
+        assert results[2] == ({"key": "c"}, None)
+        assert validate_keys_bulk([]) == []
+
 @pytest.fixture
 def mock_providers_file():
     """Create a temporary providers file for testing."""
@@ -115,10 +269,15 @@ class TestGenericProvider:
         mock_response = MagicMock()
         mock_response.json.return_value = {"status": "ok"}
         
-        with patch('requests.get', return_value=mock_response) as mock_get:
+        with patch('keymaster.providers._get_session') as mock_session:
+            mock_get = mock_session.return_value.get
+            mock_get.return_value = mock_response
             result = provider.test_key("test-key")
             assert result["status"] == "valid"
-            mock_get.assert_called_once()
+            mock_get.assert_called_once_with(
+                "https://api.test.com/validate?appid=test-key",
+                timeout=PROVIDER_TEST_TIMEOUT
+            )
             
     def test_test_key_without_url(self, clear_providers):
         """Test key validation without a test URL."""
@@ -130,6 +289,18 @@ class TestGenericProvider:
         result = provider.test_key("test-key")
         assert result["status"] == "untested"
         
+    def test_get_providers_is_live_read_only_view(self, clear_providers):
+        """Test that get_providers reflects registrations and cannot be modified."""
+        providers = get_providers()
+        
+        registered = GenericProvider(service_name="TestAPI", description="Test API Service")
+        _providers["testapi"] = registered
+        
+        assert get_providers() is providers
+        assert providers["testapi"] is registered
+        with pytest.raises(TypeError):
+            providers["other"] = registered
+    
     def test_load_generic_providers(self, clear_providers, mock_providers_file):
         """Test loading generic providers from file."""
         test_data = [
@@ -153,6 +324,19 @@ class TestGenericProvider:
             assert get_provider_by_name("testapi1") is not None
             assert get_provider_by_name("testapi2") is not None
             
+    def test_load_generic_providers_does_not_rewrite_file(self, clear_providers, mock_providers_file):
+        """Test that loading providers only reads the providers file."""
+        with open(mock_providers_file, 'w') as f:
+            json.dump([{"service_name": "TestAPI1", "description": "Test Service 1"}], f)
+            
+        with patch('keymaster.providers._get_providers_file', return_value=mock_providers_file), \
+             patch('keymaster.providers._save_generic_providers') as mock_save:
+            _load_generic_providers()
+            _load_generic_providers()
+            
+        mock_save.assert_not_called()
+        assert isinstance(get_provider_by_name("testapi1"), GenericProvider)
+            
     def test_save_generic_providers(self, clear_providers, mock_providers_file):
         """Test saving generic providers to file."""
         with patch('keymaster.providers._get_providers_file', return_value=mock_providers_file):
@@ -203,6 +203,28 @@ class TestKeyRotator:
         
         assert "validation failed" in str(exc_info.value)
     
+    @patch('keymaster.rotation.KeyStore.get_key')
+    @patch('keymaster.rotation.get_provider_by_name')
+    @patch.object(KeyRotator, '_create_pre_rotation_backup')
+    def test_rotate_key_test_failure_skips_backup(self, mock_backup, mock_get_provider, mock_get_key):
+        """Test that an invalid new key fails before the old key is read or backed up."""
+        mock_provider = MagicMock()
+        mock_provider.test_key.side_effect = Exception("Invalid key")
+        mock_get_provider.return_value = mock_provider
+        
+        with pytest.raises(RotationError):
+            self.rotator.rotate_key(
+                service=self.test_service,
+                environment=self.test_environment,
+                new_key=self.test_key,
+                test_key=True,
+                create_backup=True,
+                backup_password="test_password"
+            )
+        
+        mock_get_key.assert_not_called()
+        mock_backup.assert_not_called()
+    
     @patch('keymaster.rotation.KeyStore.get_key')
     @patch('keymaster.rotation.KeyStore.store_key')
     @patch('keymaster.rotation.get_provider_by_name')
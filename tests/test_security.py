@@ -88,7 +88,7 @@ class TestKeyStore:
         KeyStore.store_key('OpenAI', 'test', 'test-key')
         
         # Then remove it
-        KeyStore.remove_key('OpenAI', 'test')
+        assert KeyStore.remove_key('OpenAI', 'test') is True
         assert mock_keyring.get_password('keymaster-openai', 'test') is None
         mock_db.remove_key.assert_called_once()
             
@@ -107,6 +107,43 @@ class TestKeyStore:
             with pytest.raises(KeymasterKeyringError):
                 KeyStore._verify_backend()
                 
+    def test_verify_backend_once_per_process(self):
+        """Test that the backend is only selected and checked on the first call"""
+        with patch.object(KeyStore, '_check_backend') as mock_check:
+            KeyStore._verify_backend()
+            KeyStore._verify_backend()
+        mock_check.assert_called_once()
+        
+    def test_verify_backend_failure_not_remembered(self):
+        """Test that a failed check is repeated on the next call"""
+        mock_backend = MagicMock()
+        mock_backend.__class__.__name__ = "PlaintextKeyring"
+        with patch('keyring.get_keyring', return_value=mock_backend):
+            for _ in range(2):
+                with pytest.raises(KeymasterKeyringError):
+                    KeyStore._verify_backend()
+        assert KeyStore._backend_verified is False
+                
+    def test_self_test(self, mock_keyring, mock_db):
+        """Test the storage probe round-trips through the keyring without metadata"""
+        assert KeyStore.self_test() is True
+        assert mock_keyring.get_password('keymaster-self-test', 'keymaster-self-test') is None
+        mock_db.add_key.assert_not_called()
+        
+    def test_get_keys_single_metadata_query(self, mock_keyring, mock_db):
+        """Test that bulk retrieval reads all metadata with one query"""
+        mock_keyring.set_password('keymaster-openai', 'dev', 'sk-dev')
+        mock_db.get_keys_metadata.return_value = {
+            ('openai', 'dev'): {'keychain_service_name': 'keymaster-openai'},
+            ('openai', 'prod'): {'keychain_service_name': 'keymaster-openai'},
+        }
+        
+        keys = KeyStore.get_keys([('OpenAI', 'dev'), ('OpenAI', 'prod'), ('Stability', 'dev')])
+        
+        assert keys == {('OpenAI', 'dev'): 'sk-dev', ('OpenAI', 'prod'): None, ('Stability', 'dev'): None}
+        mock_db.get_keys_metadata.assert_called_once()
+        mock_db.get_key_metadata.assert_not_called()
+        
     def test_list_keys_empty(self, test_db, mock_keyring, mock_db):
         """Test listing keys when none exist"""
         mock_db.list_keys.return_value = []
@@ -172,7 +209,7 @@ class TestKeyStore:
         """Test removing a key that doesn't exist"""
         mock_db.get_key_metadata.return_value = None
         # Should not raise an error
-        KeyStore.remove_key('NonExistent', 'test')
+        assert KeyStore.remove_key('NonExistent', 'test') is False
         
     def test_remove_key_delete_error(self, test_db, mock_keyring, mock_db):
         """Test handling of PasswordDeleteError during key removal"""
@@ -214,4 +251,86 @@ class TestKeyStore:
         """Test the format of generated keyring service names"""
         service_name = KeyStore._get_keyring_service_name('OpenAI', 'prod')
         assert service_name == 'keymaster-openai'
-        assert service_name.islower()  # Should be lowercase 
\ No newline at end of file
+        assert service_name.islower()  # Should be lowercase 
+
+class TestKeyCache:
+    """Test opt-in in-process caching of retrieved keys."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        KeyStore.clear_cache()
+        yield
+        KeyStore.clear_cache()
+
+    def test_cache_disabled_by_default(self, mock_keyring, mock_db, monkeypatch):
+        """Test that keys are not cached unless KEYMASTER_CACHE_SECRETS=1."""
+        monkeypatch.delenv("KEYMASTER_CACHE_SECRETS", raising=False)
+        KeyStore.store_key('OpenAI', 'test', 'test-key')
+        KeyStore.get_key('OpenAI', 'test')
+        KeyStore.get_key('OpenAI', 'test')
+        assert mock_db.get_key_metadata.call_count == 2
+        assert KeyStore._key_cache == {}
+
+    def test_repeated_get_key_hits_cache(self, mock_keyring, mock_db, monkeypatch):
+        """Test that repeated lookups skip secure storage when caching is enabled."""
+        monkeypatch.setenv("KEYMASTER_CACHE_SECRETS", "1")
+        KeyStore.store_key('OpenAI', 'test', 'test-key')
+        assert KeyStore.get_key('OpenAI', 'test') == 'test-key'
+        assert KeyStore.get_key('openai', 'TEST') == 'test-key'
+        assert mock_db.get_key_metadata.call_count == 1
+
+    def test_store_and_remove_invalidate_cache(self, mock_keyring, mock_db, monkeypatch):
+        """Test that writes never leave a stale cached key behind."""
+        monkeypatch.setenv("KEYMASTER_CACHE_SECRETS", "1")
+        KeyStore.store_key('OpenAI', 'test', 'old-key')
+        assert KeyStore.get_key('OpenAI', 'test') == 'old-key'
+
+        KeyStore.store_key('OpenAI', 'test', 'new-key')
+        assert KeyStore.get_key('OpenAI', 'test') == 'new-key'
+
+        KeyStore.remove_key('OpenAI', 'test')
+        mock_db.get_key_metadata.return_value = None
+        assert KeyStore.get_key('OpenAI', 'test') is None
+
+
+class TestListingCache:
+    """Test sharing one key listing across a CLI invocation."""
+
+    @patch('keymaster.providers._load_generic_providers')
+    @patch('keymaster.providers.get_provider_by_name', return_value=None)
+    def test_listing_queried_once(self, mock_get_provider, mock_load_providers, mock_keyring, mock_db):
+        """Test that list_keys calls inside the block share one query and filter it."""
+        mock_db.list_keys.return_value = [
+            ('openai', 'dev', '2024-01-01T00:00:00', 'user'),
+            ('openai', 'prod', '2024-01-01T00:00:00', 'user'),
+            ('stability', 'dev', '2024-01-01T00:00:00', 'user'),
+        ]
+
+        with KeyStore.cached_listing():
+            assert len(KeyStore.list_keys()) == 3
+            assert [e for _, e, _, _ in KeyStore.list_keys('OPENAI')] == ['dev', 'prod']
+            assert KeyStore.list_keys('openai', 'Prod') == [('openai', 'prod', '2024-01-01T00:00:00', 'user')]
+            assert KeyStore.list_keys(environment='dev')[1][0] == 'stability'
+        assert mock_db.list_keys.call_count == 1
+        assert KeyStore._listing is None
+        mock_load_providers.assert_not_called()
+
+        KeyStore.list_keys()
+        assert mock_db.list_keys.call_count == 2
+
+    @patch('keymaster.providers._load_generic_providers')
+    @patch('keymaster.providers.get_provider_by_name', return_value=None)
+    def test_writes_invalidate_listing(self, mock_get_provider, mock_load_providers, mock_keyring, mock_db):
+        """Test that storing or removing a key makes the next list_keys query again."""
+        mock_db.list_keys.return_value = []
+
+        with KeyStore.cached_listing():
+            KeyStore.list_keys()
+            KeyStore.store_key('openai', 'test', 'test-key')
+            KeyStore.list_keys()
+            KeyStore.remove_key('openai', 'test')
+            KeyStore.list_keys()
+            KeyStore.remove_key_metadata('openai', 'test')
+            KeyStore.list_keys()
+
+        assert mock_db.list_keys.call_count == 4
@@ -171,4 +171,51 @@ class TestServiceEnvironmentSelector:
             ServiceEnvironmentSelector.find_environment_with_fuzzy_matching('invalid', 'openai')
         
         assert 'invalid' in str(exc_info.value)
-        assert 'openai' in str(exc_info.value)
\ No newline at end of file
+        assert 'openai' in str(exc_info.value)    
+    @patch('keymaster.selection.prompt_selection')
+    @patch('keymaster.selection.ServiceEnvironmentSelector.get_services_with_keys')
+    def test_select_service_with_single_service(self, mock_get_services, mock_prompt):
+        """Test that a single service with keys is selected without prompting."""
+        mock_get_services.return_value = {'OpenAI'}
+        
+        assert ServiceEnvironmentSelector.select_service_with_keys() == 'OpenAI'
+        mock_prompt.assert_not_called()
+    
+    @patch('keymaster.selection.prompt_selection')
+    @patch('keymaster.selection.ServiceEnvironmentSelector.get_services_with_keys')
+    def test_select_service_single_service_without_auto_select(self, mock_get_services, mock_prompt):
+        """Test that the prompt is still shown for a single service when auto-select is off."""
+        mock_get_services.return_value = {'OpenAI'}
+        mock_prompt.return_value = ('OpenAI', False)
+        
+        assert ServiceEnvironmentSelector.select_service_with_keys(auto_select=False) == 'OpenAI'
+        mock_prompt.assert_called_once()
+    
+    @patch('keymaster.selection.prompt_selection')
+    @patch('keymaster.selection.ServiceEnvironmentSelector.get_services_with_keys')
+    def test_select_service_with_multiple_services(self, mock_get_services, mock_prompt):
+        """Test that multiple services are offered in sorted order."""
+        mock_get_services.return_value = {'OpenAI', 'Anthropic'}
+        mock_prompt.return_value = ('Anthropic', False)
+        
+        assert ServiceEnvironmentSelector.select_service_with_keys() == 'Anthropic'
+        mock_prompt.assert_called_once_with("Select service:", ['Anthropic', 'OpenAI'], show_descriptions=True)
+    
+    @patch('keymaster.selection.prompt_selection')
+    @patch('keymaster.selection.ServiceEnvironmentSelector.get_environments_for_service')
+    def test_select_environment_single_environment(self, mock_get_environments, mock_prompt):
+        """Test that a single environment is selected without prompting."""
+        mock_get_environments.return_value = ['prod']
+        
+        assert ServiceEnvironmentSelector.select_environment_for_service('OpenAI') == 'prod'
+        mock_prompt.assert_not_called()
+    
+    @patch('keymaster.selection.prompt_selection')
+    @patch('keymaster.selection.ServiceEnvironmentSelector.get_environments_for_service')
+    def test_select_environment_single_environment_allow_new(self, mock_get_environments, mock_prompt):
+        """Test that the prompt is still shown when a new environment may be entered."""
+        mock_get_environments.return_value = ['prod']
+        mock_prompt.return_value = ('qa', True)
+        
+        assert ServiceEnvironmentSelector.select_environment_for_service('OpenAI', allow_new=True) == 'qa'
+        mock_prompt.assert_called_once()
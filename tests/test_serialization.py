@@ -0,0 +1,62 @@
+"""Tests for the JSON serialization helpers."""
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+from keymaster import serialization
+
+
+class TestSerialization:
+    """Test serialization helpers with and without orjson."""
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_round_trip(self, use_orjson):
+        """Test that dumps output can be read back by loads."""
+        data = {"event_type": "add_key", "metadata": {"count": 2, "names": ["a", "é"]}}
+        orjson_module = serialization.orjson if use_orjson else None
+        if use_orjson and orjson_module is None:
+            pytest.skip("orjson not installed")
+
+        with patch.object(serialization, "orjson", orjson_module):
+            encoded = serialization.dumps(data)
+            assert isinstance(encoded, bytes)
+            assert b" " not in encoded  # Compact output
+            assert serialization.loads(encoded) == data
+            assert json.loads(encoded) == data
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_default_fallback(self, use_orjson):
+        """Test that the default callable handles unsupported types."""
+        orjson_module = serialization.orjson if use_orjson else None
+        if use_orjson and orjson_module is None:
+            pytest.skip("orjson not installed")
+
+        class Opaque:
+            pass
+
+        with patch.object(serialization, "orjson", orjson_module):
+            encoded = serialization.dumps({"value": Opaque()}, default=lambda o: "opaque")
+            assert serialization.loads(encoded) == {"value": "opaque"}
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_loads_memoryview(self, use_orjson):
+        """Test that loads accepts a memoryview with and without orjson."""
+        orjson_module = serialization.orjson if use_orjson else None
+        if use_orjson and orjson_module is None:
+            pytest.skip("orjson not installed")
+
+        with patch.object(serialization, "orjson", orjson_module):
+            assert serialization.loads(memoryview(b'{"keys": [1, 2]}')) == {"keys": [1, 2]}
+
+    def test_loads_invalid(self):
+        """Test that invalid JSON raises ValueError."""
+        with pytest.raises(ValueError):
+            serialization.loads(b"{not json")
+
+    def test_dumps_datetime_with_default(self):
+        """Test serializing datetimes through the default callable."""
+        encoded = serialization.dumps({"ts": datetime(2024, 1, 1)}, default=str)
+        assert serialization.loads(encoded)["ts"].startswith("2024-01-01")
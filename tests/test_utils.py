@@ -0,0 +1,71 @@
+"""Tests for CLI utility helpers."""
+
+import pytest
+from unittest.mock import patch, MagicMock
+
+from keymaster.utils import prompt_selection, get_current_user
+
+
+class TestPromptSelection:
+    """Test the numbered option prompt."""
+
+    def test_shows_descriptions_with_single_registry_lookup(self, capsys):
+        """Test that provider descriptions are shown and the registry is read once."""
+        provider = MagicMock()
+        provider.description = "Test provider"
+
+        with patch('keymaster.utils.get_providers', return_value={'openai': provider}) as mock_get, \
+             patch('builtins.input', return_value='2'):
+            result = prompt_selection("Select service:", ['OpenAI', 'Custom'], show_descriptions=True)
+
+        assert result == ('Custom', False)
+        assert mock_get.call_count == 1
+        output = capsys.readouterr().out
+        assert "[1] OpenAI: Test provider" in output
+        assert "[2] Custom" in output
+
+    def test_no_registry_lookup_without_descriptions(self):
+        """Test that the registry is not consulted when descriptions are off."""
+        with patch('keymaster.utils.get_providers') as mock_get, \
+             patch('builtins.input', return_value='1'):
+            result = prompt_selection("Select environment:", ['dev', 'prod'])
+
+        assert result == ('dev', False)
+        mock_get.assert_not_called()
+
+    def test_new_option(self):
+        """Test entering a new option when allowed."""
+        with patch('builtins.input', side_effect=['', 'qa']):
+            result = prompt_selection("Select environment:", ['dev'], allow_new=True)
+
+        assert result == ('qa', True)
+
+
+class TestGetCurrentUser:
+    """Test resolving the user name for audit records."""
+
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        get_current_user.cache_clear()
+        yield
+        get_current_user.cache_clear()
+
+    def test_uses_user_env(self, monkeypatch):
+        """Test that $USER is preferred and the result is cached."""
+        monkeypatch.setenv("USER", "alice")
+        assert get_current_user() == "alice"
+
+        monkeypatch.setenv("USER", "bob")
+        assert get_current_user() == "alice"
+
+    def test_falls_back_to_getpass(self, monkeypatch):
+        """Test the getpass fallback when $USER is unset."""
+        monkeypatch.delenv("USER", raising=False)
+        with patch('keymaster.utils.getpass.getuser', return_value="carol"):
+            assert get_current_user() == "carol"
+
+    def test_unknown_when_unresolvable(self, monkeypatch):
+        """Test that an unresolvable user does not raise."""
+        monkeypatch.delenv("USER", raising=False)
+        with patch('keymaster.utils.getpass.getuser', side_effect=OSError("no user")):
+            assert get_current_user() == "unknown"